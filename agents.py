@@ -5,9 +5,13 @@ Phase 1: RuleArchitectAgent  — ingests PDF, extracts structured policy rules
 Phase 2: QueryEngineerAgent  — translates rules to SQL, executes safely
 """
 
+import threading
+from functools import lru_cache
+from typing import Final
+
 from crewai import Agent
 
-from config import AGENT_MAX_ITER, AGENT_VERBOSE, get_llm
+from config import AGENT_MAX_ITER, AGENT_VERBOSE, PREWARM_PDF_MODELS, get_llm
 from tools import (
     DoclingPDFParserTool,
     DuckDBExecutionSandboxTool,
@@ -15,7 +19,61 @@ from tools import (
     SecureSQLValidatorTool,
 )
 
+# ── Prompt text ───────────────────────────────────────────────────────────────
+# Kept at module level so every LLM call sends a byte-identical system prompt
+# prefix, which lets the provider's prompt cache skip re-processing it.
+
+_RULE_ARCHITECT_ROLE: Final[str] = "Regulatory Intelligence Analyst"
+_QUERY_ENGINEER_ROLE: Final[str] = "Secure Database Query Engineer"
+
+_RULE_ARCHITECT_GOAL: Final[str] = (
+    "Transform unstructured regulatory PDF documents into precise, structured "
+    "Policy-as-Code JSON rules. Each rule must capture the exact condition, "
+    "threshold, and enforcement logic embedded in the legal text, ready for "
+    "automated SQL generation."
+)
+
+_RULE_ARCHITECT_BACKSTORY: Final[str] = (
+    "You are a world-class compliance expert with 20 years of experience "
+    "in financial regulation — AML/CFT frameworks, FinCEN advisories, FATF "
+    "recommendations, and Basel III compliance. You are obsessively precise: "
+    "you never paraphrase when the law states a specific number, and you never "
+    "miss an IF/THEN condition buried in a footnote. You have also mastered "
+    "structured data modelling and can express any legal rule as a clean "
+    "machine-readable JSON object with field: id, rule_type, description, "
+    "condition_field, operator, threshold_value, and sql_hint."
+)
+
+_QUERY_ENGINEER_GOAL: Final[str] = (
+    "Read structured policy rules from the JSON rule store and translate each "
+    "rule's logic into a precise, read-only SELECT SQL query. Every SELECT must "
+    "project aggregate violation counts, sums, and identifiers (e.g. COUNT(*) "
+    "FILTER (WHERE ...), SUM(Amount_Paid)) — never SELECT *. Validate every "
+    "query for safety before execution. Execute the validated queries against "
+    "the AML transaction database in batches — pass them together as one "
+    "'queries' list of {sql, rule_id} objects rather than one call per query — "
+    "and return a structured violation report."
+)
+
+_QUERY_ENGINEER_BACKSTORY: Final[str] = (
+    "You are a senior data engineer specialising in financial crime analytics "
+    "and compliance SQL. You know the IBM AML transaction database schema "
+    "intimately — columns like Timestamp, From Bank, Account, To Bank, "
+    "Account.1, Amount Received, Receiving Currency, Amount Paid, "
+    "Payment Currency, Payment Format, and Is Laundering. "
+    "You write SQL that is razor-sharp and read-only. You never touch DDL. "
+    "You think in terms of thresholds, aggregations, and transaction patterns. "
+    "Every query you write is reviewed by a security validator before it "
+    "reaches the database — you welcome this and write SQL that will pass "
+    "validation on the first attempt."
+)
+
+
+def _pdf_parser_tool() -> DoclingPDFParserTool:
+    return DoclingPDFParserTool(backend="pypdfium2", ocr=False)
 
+
+@lru_cache(maxsize=1)
 def build_rule_architect_agent() -> Agent:
     """
     Phase 1 — RuleArchitectAgent.
@@ -23,27 +81,16 @@ def build_rule_architect_agent() -> Agent:
     Expert at reading legal and regulatory text (AML directives, FinCEN guidance,
     Basel III frameworks) and converting natural language rules into structured
     Policy-as-Code JSON.
+
+    Built once per process: the agent is stateless (memory=False), so the
+    LLM client and tool instances are safely shared across runs.
     """
     return Agent(
-        role="Regulatory Intelligence Analyst",
-        goal=(
-            "Transform unstructured regulatory PDF documents into precise, structured "
-            "Policy-as-Code JSON rules. Each rule must capture the exact condition, "
-            "threshold, and enforcement logic embedded in the legal text, ready for "
-            "automated SQL generation."
-        ),
-        backstory=(
-            "You are a world-class compliance expert with 20 years of experience "
-            "in financial regulation — AML/CFT frameworks, FinCEN advisories, FATF "
-            "recommendations, and Basel III compliance. You are obsessively precise: "
-            "you never paraphrase when the law states a specific number, and you never "
-            "miss an IF/THEN condition buried in a footnote. You have also mastered "
-            "structured data modelling and can express any legal rule as a clean "
-            "machine-readable JSON object with field: id, rule_type, description, "
-            "condition_field, operator, threshold_value, and sql_hint."
-        ),
-        tools=[DoclingPDFParserTool(), RuleStoreWriterTool()],
-        llm=get_llm(),
+        role=_RULE_ARCHITECT_ROLE,
+        goal=_RULE_ARCHITECT_GOAL,
+        backstory=_RULE_ARCHITECT_BACKSTORY,
+        tools=[_pdf_parser_tool(), RuleStoreWriterTool()],
+        llm=get_llm("architect"),
         max_iter=AGENT_MAX_ITER,
         verbose=AGENT_VERBOSE,
         allow_delegation=False,
@@ -51,40 +98,38 @@ def build_rule_architect_agent() -> Agent:
     )
 
 
+@lru_cache(maxsize=1)
 def build_query_engineer_agent() -> Agent:
     """
     Phase 2 — QueryEngineerAgent.
 
     Reads the structured Policy-as-Code JSON and translates each rule into
     precise, read-only SQL queries for the AML DuckDB sandbox.
+
+    Not used by main.run_phase2, which builds every rule's SQL deterministically
+    in phase2_executor._build_sql (no LLM call); rules without a condition
+    field are reported as SKIPPED there rather than handed to this agent.
+
+    Built once per process, like build_rule_architect_agent().
     """
     return Agent(
-        role="Secure Database Query Engineer",
-        goal=(
-            "Read structured policy rules from the JSON rule store and translate each "
-            "rule's logic into a precise, read-only SELECT SQL query. Validate every "
-            "query for safety before execution. Execute each validated query against "
-            "the AML transaction database and return a structured violation report."
-        ),
-        backstory=(
-            "You are a senior data engineer specialising in financial crime analytics "
-            "and compliance SQL. You know the IBM AML transaction database schema "
-            "intimately — columns like Timestamp, From Bank, Account, To Bank, "
-            "Account.1, Amount Received, Receiving Currency, Amount Paid, "
-            "Payment Currency, Payment Format, and Is Laundering. "
-            "You write SQL that is razor-sharp and read-only. You never touch DDL. "
-            "You think in terms of thresholds, aggregations, and transaction patterns. "
-            "Every query you write is reviewed by a security validator before it "
-            "reaches the database — you welcome this and write SQL that will pass "
-            "validation on the first attempt."
-        ),
+        role=_QUERY_ENGINEER_ROLE,
+        goal=_QUERY_ENGINEER_GOAL,
+        backstory=_QUERY_ENGINEER_BACKSTORY,
         tools=[
             SecureSQLValidatorTool(),
             DuckDBExecutionSandboxTool(),
         ],
-        llm=get_llm(),
+        llm=get_llm("engineer"),
         max_iter=AGENT_MAX_ITER,
         verbose=AGENT_VERBOSE,
         allow_delegation=False,
         memory=False,
     )
+
+
+# ── Optional model prewarm ─────────────────────────────────────────────────────
+# Runs in a daemon thread so importing this module never blocks; the shared
+# converter in tools.py means Phase 1 reuses the models loaded here.
+if PREWARM_PDF_MODELS:
+    threading.Thread(target=_pdf_parser_tool().prewarm, daemon=True).start()
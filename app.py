@@ -6,17 +6,32 @@ Launch: streamlit run app.py
 
 from __future__ import annotations
 
+import csv
+import html
+import io
 import json
+import os
+import queue
 import re
+import shutil
 import subprocess
 import sys
+import threading
 import time
+from collections import Counter, deque
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+import numpy as np
+import orjson
 import pandas as pd
 import streamlit as st
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
 # ── Page config (must be first Streamlit call) ──────────────────────────────
 st.set_page_config(
     page_title="Turgon — Policy Enforcement Engine",
@@ -25,184 +40,58 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# ── Local stores ─────────────────────────────────────────────────────────────
+# hitl/audit are stdlib-only, so import them once here. tools.py stays a lazy
+# import (behind the cached loaders below) — it pulls in CrewAI and Docling.
+try:
+    import hitl as _hitl
+except ImportError:
+    _hitl = None
+try:
+    import audit as _audit
+except ImportError:
+    _audit = None
+
 # ── Paths ────────────────────────────────────────────────────────────────────
 ROOT         = Path(__file__).parent.resolve()
 RULES_JSON   = ROOT / "rules" / "policy_rules.json"
 VIOLATION_JSON = ROOT / "rules" / "violation_report.json"
+VERSIONS_JSON  = ROOT / "rules" / "policy_versions.json"
+EXPLANATIONS_JSON = ROOT / "rules" / "explanations.json"
 UPLOADS_DIR  = ROOT / "uploads"
 UPLOADS_DIR.mkdir(exist_ok=True)
 
 # ── Light Theme CSS ──────────────────────────────────────────────────────────
-st.markdown("""
-<style>
-  @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;900&display=swap');
-
-  /* ── Hide Streamlit chrome ──────────────────────── */
-  header[data-testid="stHeader"] { background: #f8fafc !important; border-bottom: 1px solid #e2e8f0 !important; }
-  [data-testid="stToolbar"] { display: none !important; }
-  .stDeployButton { display: none !important; }
-  #MainMenu { visibility: hidden !important; }
-  footer { visibility: hidden !important; }
-
-  /* ── Global ─────────────────────────────────────── */
-  html, body, .stApp { background: #f0f4f8 !important; color: #1e293b; font-family: 'Inter', sans-serif; }
-  h1,h2,h3,h4 { color: #0f172a !important; }
-
-  /* ── Hero bar ───────────────────────────────────── */
-  .hero-bar {
-    background: linear-gradient(135deg, #1e40af 0%, #2563eb 50%, #1d4ed8 100%);
-    border-bottom: 1px solid #1e40af;
-    padding: 1.6rem 2rem 1.2rem;
-    margin: -1rem -1rem 1.5rem -1rem;
-    position: relative; overflow: hidden;
-  }
-  .hero-bar::before {
-    content: ''; position: absolute; top: -60%; left: -30%;
-    width: 160%; height: 220%;
-    background: radial-gradient(ellipse at center, rgba(255,255,255,0.12) 0%, transparent 70%);
-    animation: pulse-glow 6s ease-in-out infinite;
-  }
-  @keyframes pulse-glow { 0%,100% { opacity:.5; } 50% { opacity:1; } }
-  .hero-title {
-    font-size: 2rem; font-weight: 900; color: #fff;
-    letter-spacing: -1px; margin: 0;
-  }
-  .hero-sub { color: rgba(255,255,255,.75); font-size: .9rem; margin-top: .2rem; font-weight: 400; }
-  .hero-badges { margin-top: .8rem; display: flex; gap: .5rem; flex-wrap: wrap; }
-  .hero-badge {
-    display: inline-flex; align-items: center; gap: .35rem;
-    background: rgba(255,255,255,0.15); border: 1px solid rgba(255,255,255,0.3);
-    color: #fff; border-radius: 20px; padding: 3px 12px;
-    font-size: .72rem; font-weight: 600; letter-spacing: .3px;
-  }
-
-  /* ── KPI cards ──────────────────────────────────── */
-  .kpi-grid { display: flex; gap: 1rem; margin-bottom: 1.5rem; flex-wrap: wrap; }
-  .kpi-card {
-    flex: 1; min-width: 160px;
-    background: #ffffff;
-    border: 1px solid #e2e8f0; border-radius: 14px;
-    padding: 1.2rem 1.4rem;
-    box-shadow: 0 2px 8px rgba(0,0,0,.06);
-    position: relative; overflow: hidden;
-    transition: transform .15s, box-shadow .15s;
-  }
-  .kpi-card:hover { transform: translateY(-2px); box-shadow: 0 8px 24px rgba(0,0,0,.1); }
-  .kpi-card::before {
-    content: ''; position: absolute;
-    top: 0; left: 0; right: 0; height: 3px; border-radius: 14px 14px 0 0;
-  }
-  .kpi-card.blue::before  { background: linear-gradient(90deg,#1d4ed8,#3b82f6); }
-  .kpi-card.red::before   { background: linear-gradient(90deg,#b91c1c,#ef4444); }
-  .kpi-card.amber::before { background: linear-gradient(90deg,#b45309,#f59e0b); }
-  .kpi-card.green::before { background: linear-gradient(90deg,#15803d,#22c55e); }
-  .kpi-card.purple::before{ background: linear-gradient(90deg,#6d28d9,#a78bfa); }
-  .kpi-label { font-size: .7rem; text-transform: uppercase; letter-spacing: 1.2px; color: #64748b; font-weight: 600; margin-bottom: .4rem; }
-  .kpi-value { font-size: 2.2rem; font-weight: 800; line-height: 1; color: #0f172a; font-variant-numeric: tabular-nums; }
-  .kpi-sub   { font-size: .74rem; color: #94a3b8; margin-top: .3rem; }
-  .kpi-icon  { position: absolute; top: .9rem; right: 1rem; font-size: 1.5rem; opacity: .15; }
-
-  /* ── Violation cards ────────────────────────────── */
-  .v-card {
-    border-radius: 10px; padding: 1rem 1.2rem; margin-bottom: .75rem;
-    border-left: 4px solid; background: #fff;
-    box-shadow: 0 1px 4px rgba(0,0,0,.06);
-    transition: all .15s;
-  }
-  .v-card:hover { transform: translateX(2px); box-shadow: 0 4px 12px rgba(0,0,0,.1); }
-  .v-card.high   { border-color: #ef4444; background: #fff5f5; }
-  .v-card.medium { border-color: #f59e0b; background: #fffbeb; }
-  .v-card.low    { border-color: #22c55e; background: #f0fdf4; }
-  .v-card.clear  { border-color: #22c55e; background: #f0fdf4; }
-  .v-header { display:flex; justify-content:space-between; align-items:center; margin-bottom:.4rem; }
-  .v-rule-id { font-weight: 700; font-size: 1rem; color: #0f172a; }
-  .v-count { font-size: 1.6rem; font-weight: 800; }
-  .v-count.high   { color: #dc2626; }
-  .v-count.medium { color: #d97706; }
-  .v-count.low    { color: #16a34a; }
-  .v-desc  { color: #475569; font-size: .84rem; margin: .3rem 0 .5rem; line-height: 1.4; }
-  .v-footer{ display:flex; gap:.5rem; flex-wrap:wrap; align-items:center; }
-
-  /* ── Badges ─────────────────────────────────────── */
-  .badge { display: inline-block; padding: 2px 10px; border-radius: 20px; font-size: .68rem; font-weight: 700; letter-spacing: .5px; text-transform: uppercase; }
-  .badge-red    { background:#fee2e2; color:#dc2626; border:1px solid #fca5a5; }
-  .badge-amber  { background:#fef3c7; color:#d97706; border:1px solid #fcd34d; }
-  .badge-green  { background:#dcfce7; color:#16a34a; border:1px solid #86efac; }
-  .badge-blue   { background:#dbeafe; color:#1d4ed8; border:1px solid #93c5fd; }
-  .badge-purple { background:#ede9fe; color:#6d28d9; border:1px solid #c4b5fd; }
-  .badge-grey   { background:#f1f5f9; color:#64748b; border:1px solid #cbd5e1; }
-
-  /* ── Section headings ───────────────────────────── */
-  .sec-head {
-    font-size: 1rem; font-weight: 700; color: #0f172a;
-    border-bottom: 1px solid #e2e8f0; padding-bottom: .5rem; margin-bottom: 1rem;
-    display: flex; align-items: center; gap: .5rem;
-  }
-
-  /* ── Sidebar ────────────────────────────────────── */
-  section[data-testid="stSidebar"] { background: #ffffff !important; border-right: 1px solid #e2e8f0 !important; }
-  section[data-testid="stSidebar"] .stMarkdown h2 { color: #1d4ed8 !important; }
-  section[data-testid="stSidebar"] .stMarkdown p { color: #1e293b !important; }
-  section[data-testid="stSidebar"] .stMarkdown h3 { color: #0f172a !important; }
-  section[data-testid="stSidebar"] [data-testid="stWidgetLabel"] p { color: #1e293b !important; }
-  section[data-testid="stSidebar"] [data-testid="stMetricLabel"] { color: #64748b !important; }
-  section[data-testid="stSidebar"] [data-testid="stMetricValue"] { color: #0f172a !important; }
-  section[data-testid="stSidebar"] .stRadio label p { color: #1e293b !important; }
-  section[data-testid="stSidebar"] .stCaption p { color: #64748b !important; }
-  section[data-testid="stSidebar"] [data-testid="stFileUploader"] { background: #f8fafc !important; border: 1px dashed #94a3b8 !important; border-radius: 8px !important; }
-  section[data-testid="stSidebar"] [data-testid="stFileUploaderDropzoneInstructions"] p { color: #1e293b !important; }
-  section[data-testid="stSidebar"] [data-testid="stFileUploaderDropzoneInstructions"] span { color: #64748b !important; }
-
-  /* ── Tabs ───────────────────────────────────────── */
-  button[data-baseweb="tab"] { background: transparent !important; color: #64748b !important; font-weight: 600; transition: all .15s; }
-  button[data-baseweb="tab"][aria-selected="true"] { color: #1d4ed8 !important; border-bottom: 2px solid #1d4ed8 !important; }
-
-  /* ── Buttons ────────────────────────────────────── */
-  .stButton > button { border-radius: 8px !important; font-weight: 600 !important; transition: all .15s !important; }
-  [data-testid="baseButton-primary"] {
-    background: linear-gradient(135deg,#1d4ed8,#2563eb) !important;
-    border: none !important; color: #fff !important;
-    box-shadow: 0 2px 8px rgba(29,78,216,.3) !important;
-  }
-  [data-testid="baseButton-primary"]:hover {
-    transform: translateY(-1px) !important;
-    box-shadow: 0 6px 20px rgba(29,78,216,.4) !important;
-  }
-
-  /* ── Code / pre ─────────────────────────────────── */
-  pre, code { background: #f8fafc !important; border: 1px solid #e2e8f0 !important; border-radius: 8px !important; font-size: .82rem !important; color: #1e293b !important; }
-
-  /* ── Log box ────────────────────────────────────── */
-  .log-box {
-    background: #f8fafc; border: 1px solid #e2e8f0; border-radius: 10px;
-    padding: .8rem 1rem; font-family: monospace; font-size: .78rem;
-    color: #166534; max-height: 360px; overflow-y: auto; line-height: 1.5;
-  }
-
-  /* ── Streamlit overrides ────────────────────────── */
-  .stDataFrame { border-radius: 10px !important; overflow: hidden !important; }
-  div[data-testid="stMetric"] { background: #fff; border-radius: 10px; padding: .8rem; border: 1px solid #e2e8f0 !important; }
-  div[data-testid="stMetric"] label { color: #64748b !important; }
-  hr { border-color: #e2e8f0 !important; margin: 1.5rem 0 !important; }
-  details summary { color: #1d4ed8 !important; font-weight: 600; font-size: .85rem; }
-  details { border: 1px solid #e2e8f0 !important; border-radius: 8px !important; }
-  [data-testid="stFileUploader"] { background: #fff !important; border: 1px solid #e2e8f0 !important; border-radius: 8px !important; }
-  .stSelectbox [data-baseweb="select"] > div { background: #fff !important; border-color: #cbd5e1 !important; }
-  .stTextInput > div > div { background: #fff !important; border-color: #cbd5e1 !important; }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def _css() -> str:
+    """Read the theme stylesheet once per server process."""
+    return (ROOT / "assets" / "turgon.css").read_text(encoding="utf-8")
+
+
+# Streamlit drops any element a rerun does not re-emit, so the <style> block is
+# still written every run; only the file read is cached.
+st.markdown(f"<style>\n{_css()}</style>", unsafe_allow_html=True)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # Helpers
 # ═══════════════════════════════════════════════════════════════════════════
 
+_JSON_FENCE_RE = re.compile(r"```json\s*(\[.*?\])\s*```", re.DOTALL)
+_BARE_FENCE_RE = re.compile(r"```\s*(\[.*?\])\s*```", re.DOTALL)
+
+
+def _json_download(obj) -> bytes:
+    """Pretty-printed JSON payload for st.download_button."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+
 def _extract_json_list(text: str) -> list | None:
-    m = re.search(r"```json\s*(\[.*?\])\s*```", text, re.DOTALL)
+    m = _JSON_FENCE_RE.search(text)
     if m:
         try: return json.loads(m.group(1))
         except Exception: pass
-    m = re.search(r"```\s*(\[.*?\])\s*```", text, re.DOTALL)
+    m = _BARE_FENCE_RE.search(text)
     if m:
         try: return json.loads(m.group(1))
         except Exception: pass
@@ -213,60 +102,261 @@ def _extract_json_list(text: str) -> list | None:
     return None
 
 
-@st.cache_data(ttl=5)
-def load_rules() -> list[dict]:
-    if RULES_JSON.exists():
-        try: return json.loads(RULES_JSON.read_text(encoding="utf-8"))
-        except Exception: pass
+def _file_key(p: Path) -> tuple[str, int, int] | None:
+    """(path, mtime_ns, size) — changes whenever the file is rewritten."""
+    try:
+        st_res = p.stat()
+    except OSError:
+        return None
+    return str(p), st_res.st_mtime_ns, st_res.st_size
+
+
+# Keyed on _file_key(), so no TTL: an unchanged file is never re-parsed and a
+# rewritten one is picked up on the next rerun. Results are shared, not copied —
+# callers must not mutate them.
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _parse_json_file(path_str: str, mtime_ns: int, size: int):
+    try: return orjson.loads(Path(path_str).read_bytes())
+    except Exception: return None
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _file_bytes(path_str: str, mtime_ns: int, size: int) -> bytes:
+    """Raw file contents for a download that is already JSON on disk — no parse/re-encode."""
+    try: return Path(path_str).read_bytes()
+    except Exception: return b""
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _parse_violations_file(path_str: str, mtime_ns: int, size: int) -> list[dict]:
+    try:
+        raw = Path(path_str).read_bytes()
+    except Exception:
+        return []
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Agent output may wrap the JSON array in prose/fences — salvage it from the same read
+        return _extract_json_list(raw.decode("utf-8", errors="replace")) or []
+    if isinstance(data, list): return data
+    if isinstance(data, dict) and "violations" in data: return data["violations"]
     return []
 
 
-@st.cache_data(ttl=5)
+def load_rules() -> list[dict]:
+    key = _file_key(RULES_JSON)
+    return (_parse_json_file(*key) if key else None) or []
+
+
 def load_violations() -> list[dict]:
-    if VIOLATION_JSON.exists():
-        try:
-            raw = VIOLATION_JSON.read_text(encoding="utf-8")
-            data = json.loads(raw)
-            if isinstance(data, list): return data
-            if isinstance(data, dict) and "violations" in data: return data["violations"]
-        except json.JSONDecodeError:
-            raw = VIOLATION_JSON.read_text(encoding="utf-8")
-            extracted = _extract_json_list(raw)
-            if extracted: return extracted
-        except Exception: pass
-    return []
+    key = _file_key(VIOLATION_JSON)
+    return _parse_violations_file(*key) if key else []
 
 
-@st.cache_data(ttl=5)
 def load_explanations() -> list[dict]:
-    p = ROOT / "rules" / "explanations.json"
-    if p.exists():
-        try: return json.loads(p.read_text(encoding="utf-8"))
-        except Exception: pass
-    return []
+    key = _file_key(EXPLANATIONS_JSON)
+    return (_parse_json_file(*key) if key else None) or []
 
 
-def load_hitl_decisions() -> dict[str, dict]:
-    """Load HITL decisions (not cached — must always be fresh)."""
+# Severity buckets match severity_cls(): 0 clear, 1 low, 2 medium, 3 high
+_SEV_EDGES  = [1, 50, 500]
+_SEV_LABELS = np.array(["CLEAR", "LOW", "MEDIUM", "HIGH"])
+
+
+@st.cache_resource(max_entries=4)
+def _severity_vectors(path_str: str, mtime_ns: int, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """(violation counts, severity labels) per report position, computed in one numpy pass."""
+    violations = _parse_violations_file(path_str, mtime_ns, size)
+    counts = np.fromiter(
+        (v.get("violation_count", 0) for v in violations), dtype=np.int64, count=len(violations),
+    )
+    return counts, _SEV_LABELS[np.digitize(counts, _SEV_EDGES)]
+
+
+@st.cache_resource(max_entries=4)
+def _violation_kpis(path_str: str, mtime_ns: int, size: int) -> dict[str, int]:
+    violations = _parse_violations_file(path_str, mtime_ns, size)
+    counts, _ = _severity_vectors(path_str, mtime_ns, size)
+    clear, low, medium, high = np.bincount(np.digitize(counts, _SEV_EDGES), minlength=4).tolist()
+    return {
+        "total_v":   int(counts.sum()),
+        "triggered": low + medium + high,
+        "high_sev":  high,
+        "medium":    medium,
+        "low":       low,
+        "clear":     clear,
+        "blocked":   sum(1 for v in violations if v.get("status") == "BLOCKED"),
+    }
+
+
+@st.cache_resource(max_entries=4)
+def _violation_count_map(path_str: str, mtime_ns: int, size: int) -> dict[str, int]:
+    return {
+        v.get("rule_id"): v.get("violation_count", 0)
+        for v in _parse_violations_file(path_str, mtime_ns, size)
+    }
+
+
+@st.cache_resource(max_entries=4)
+def _samples_frame(path_str: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """
+    Every rule's sample rows in one frame, prefixed with rule_id/severity and
+    indexed by the rule's position in the report (rule ids can repeat).
+    """
+    positions, rows = [], []
+    for i, v in enumerate(_parse_violations_file(path_str, mtime_ns, size)):
+        sev = severity_cls(v.get("violation_count", 0)).upper()
+        for row in v.get("sample_violations", []):
+            positions.append(i)
+            rows.append({"rule_id": v.get("rule_id", "?"), "severity": sev, **row})
+    return pd.DataFrame(rows, index=positions)
+
+
+@st.cache_resource(max_entries=8)
+def _violations_csv(path_str: str, mtime_ns: int, size: int, positions: tuple[int, ...]) -> bytes:
+    """
+    CSV export of the sample rows at the given report positions (all must have
+    samples). Written row by row with csv.DictWriter straight from the report
+    dicts — no DataFrame slice/copy; the cached frame only supplies the header.
+    """
+    violations = _parse_violations_file(path_str, mtime_ns, size)
+    buf = io.StringIO()
+    writer = csv.DictWriter(
+        buf, fieldnames=list(_samples_frame(path_str, mtime_ns, size).columns),
+        restval="", extrasaction="ignore", lineterminator="\n",
+    )
+    writer.writeheader()
+    for i in positions:
+        v = violations[i]
+        head = {"rule_id": v.get("rule_id", "?"), "severity": severity_cls(v.get("violation_count", 0)).upper()}
+        for row in v.get("sample_violations", []):
+            writer.writerow({**head, **row})
+    return buf.getvalue().encode()
+
+
+def violation_count_map() -> dict[str, int]:
+    """rule_id → violation_count for the current report (shared; do not mutate)."""
+    key = _file_key(VIOLATION_JSON)
+    return _violation_count_map(*key) if key else {}
+
+
+def compute_kpis() -> dict[str, int]:
+    """Violation KPIs in one pass, shared by the sidebar and the Overview tab."""
+    key = _file_key(VIOLATION_JSON)
+    if key is None:
+        return dict.fromkeys(("total_v", "triggered", "high_sev", "medium", "low", "clear", "blocked"), 0)
+    return _violation_kpis(*key)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _hitl_decisions(path_str: str, mtime_ns: int, size: int) -> dict[str, dict]:
     try:
-        from hitl import load_decisions
-        return load_decisions()
+        return _hitl.load_decisions()
     except Exception:
         return {}
 
 
-@st.cache_data(ttl=10)
+def load_hitl_decisions() -> dict[str, dict]:
+    """Load HITL decisions — cached on the store's mtime, so always fresh."""
+    key = _file_key(_hitl.HITL_JSON) if _hitl else None
+    return _hitl_decisions(*key) if key else {}
+
+
+# HITL control option → (decision, audit note)
+_HITL_ACTIONS = {
+    "✅ Confirm":  ("CONFIRMED", ""),
+    "❌ Dismiss":  ("DISMISSED", ""),
+    "🚨 Escalate": ("ESCALATED", "Escalated for senior review"),
+}
+# Stored decision → control option, so the control opens on the saved choice
+_HITL_LABELS = {action: label for label, (action, _) in _HITL_ACTIONS.items()}
+
+
+def _apply_hitl(rule_id: str) -> None:
+    """
+    on_change callback for the HITL control: persist the analyst decision and
+    its audit event. Runs before the next script run, so no st.rerun() needed.
+    """
+    choice = st.session_state.get(f"hitl_{rule_id}")
+    if choice is None:
+        return
+    action, notes = _HITL_ACTIONS[choice]
+    _hitl.save_decision(rule_id, action)
+    _audit.log_hitl_decision(rule_id, action, "analyst", notes)
+    # Same-size rewrites can keep the HITL file key on coarse-mtime filesystems,
+    # so evict it explicitly along with the TTL'd audit log
+    _hitl_decisions.clear()
+    load_audit_log.clear()
+
+
+# cache_resource rather than cache_data: the rows are read-only here, so
+# reruns share them instead of unpickling 200 decoded rows each time.
+@st.cache_resource(ttl=10, show_spinner=False)
 def load_audit_log() -> list[dict]:
     try:
-        from audit import get_log
-        return get_log(limit=200)
+        rows = _audit.get_log(limit=200) if _audit else []
     except Exception:
         return []
+    # Decode details once per cache fill rather than per row on every rerun
+    for row in rows:
+        try:
+            row["details"] = orjson.loads(row.get("details_json") or "{}")
+        except orjson.JSONDecodeError:
+            row["details"] = {}
+    return rows
+
+
+@st.cache_resource(max_entries=4)
+def _rules_search_index(path_str: str, mtime_ns: int, size: int) -> list[tuple[dict, str]]:
+    """(rule, lowercased description/field/hint blob) pairs for the Rules tab search."""
+    return [
+        (r, "\x1f".join((r.get("description", ""), r.get("condition_field", ""), r.get("sql_hint", ""))).lower())
+        for r in (_parse_json_file(path_str, mtime_ns, size) or [])
+    ]
+
+
+@st.cache_resource(max_entries=4)
+def _rules_filter_options(path_str: str, mtime_ns: int, size: int) -> tuple[list[str], list[str]]:
+    """Rules tab selectbox options (types, operators), collected in one pass."""
+    types, ops = set(), set()
+    for r in _parse_json_file(path_str, mtime_ns, size) or []:
+        types.add(r.get("rule_type", "unknown"))
+        ops.add(r.get("operator", "?"))
+    return ["All types", *sorted(types)], ["All", *sorted(ops)]
+
+
+@st.cache_resource(max_entries=16)
+def _filtered_rules(rules_key: tuple | None, search: str, sel_type: str, sel_op: str) -> list[dict]:
+    """Rules tab filter result (search is lowercased); shared, do not mutate."""
+    if rules_key is None:
+        return []
+    if not search and sel_type == "All types" and sel_op == "All":
+        return _parse_json_file(*rules_key) or []
+    # All three predicates in one pass over the pre-lowercased search index
+    type_any, op_any = sel_type == "All types", sel_op == "All"
+    return [
+        r for r, blob in _rules_search_index(*rules_key)
+        if (type_any or r.get("rule_type") == sel_type)
+        and (op_any or r.get("operator") == sel_op)
+        and (not search or search in blob)
+    ]
 
 
-@st.cache_data(ttl=5)
-def load_version_manifest() -> list[dict]:
-    """Load policy version history (newest first)."""
+@st.cache_resource(max_entries=16)
+def _rules_json_blob(rules_key: tuple | None, search: str, sel_type: str, sel_op: str) -> bytes:
+    """Export JSON for a filter, serialised once rather than on every rerun."""
+    return _json_download(_filtered_rules(rules_key, search, sel_type, sel_op))
+
+
+def _manifest_mtime() -> int:
+    key = _file_key(VERSIONS_JSON)
+    return key[1] if key else 0
+
+
+# Archives are write-once per version, so everything below is keyed on the
+# manifest mtime and only recomputed when Phase 1 snapshots a new version.
+@st.cache_resource(max_entries=4)
+def _version_manifest(manifest_mtime_ns: int) -> list[dict]:
     try:
         from tools import load_version_manifest as _lvm
         return _lvm()
@@ -274,8 +364,21 @@ def load_version_manifest() -> list[dict]:
         return []
 
 
-def load_rules_at_version(version: int) -> list[dict]:
-    """Load archived rules for a specific version number."""
+def load_version_manifest() -> list[dict]:
+    """Load policy version history (newest first)."""
+    return _version_manifest(_manifest_mtime())
+
+
+@st.cache_resource(max_entries=4)
+def _version_labels(manifest_mtime_ns: int) -> dict[str, int]:
+    return {
+        f"v{e['version']} — {e['timestamp'][:10]} ({e['rule_count']} rules) [{e['pdf_source']}]": e["version"]
+        for e in _version_manifest(manifest_mtime_ns)
+    }
+
+
+@st.cache_resource(max_entries=16)
+def _archived_rules(version: int, manifest_mtime_ns: int) -> list[dict]:
     try:
         from tools import load_rules_at_version as _lrav
         return _lrav(version)
@@ -283,6 +386,139 @@ def load_rules_at_version(version: int) -> list[dict]:
         return []
 
 
+def load_rules_at_version(version: int) -> list[dict]:
+    """Load archived rules for a specific version number."""
+    return _archived_rules(version, _manifest_mtime())
+
+
+@st.cache_resource(max_entries=16)
+def _archived_rules_json(version: int, manifest_mtime_ns: int) -> bytes:
+    """Export JSON for an archived version; archives are write-once, so encode once."""
+    return _json_download(_archived_rules(version, manifest_mtime_ns))
+
+
+@st.cache_resource(max_entries=16)
+def _archived_fingerprints(version: int, manifest_mtime_ns: int) -> frozenset:
+    return frozenset(r.get("_fingerprint") for r in _archived_rules(version, manifest_mtime_ns))
+
+
+@st.cache_resource(max_entries=4)
+def _rule_fingerprints(path_str: str, mtime_ns: int, size: int) -> frozenset:
+    return frozenset(r.get("_fingerprint") for r in (_parse_json_file(path_str, mtime_ns, size) or []))
+
+
+def current_fingerprints() -> frozenset:
+    key = _file_key(RULES_JSON)
+    return _rule_fingerprints(*key) if key else frozenset()
+
+
+@st.cache_resource(max_entries=2)
+def _compliance_report_json(violations_key, hitl_key, explanations_key) -> bytes:
+    """
+    Serialised compliance report, rebuilt only when the violation report, HITL
+    store, or explanations file changes (keys are _file_key() tuples), so
+    unrelated reruns don't re-dump the whole report. generated_at is the build time.
+    Compact (no indent): it bundles every sample row, so pretty-printing would
+    roughly double the blob and its encode time for a machine-read download.
+    """
+    # Read through the keyed loaders, so the bytes always match the cache key
+    violations     = _parse_violations_file(*violations_key) if violations_key else []
+    hitl_decisions = _hitl_decisions(*hitl_key) if hitl_key else {}
+    explanations   = (_parse_json_file(*explanations_key) if explanations_key else None) or []
+    kpis           = _violation_kpis(*violations_key) if violations_key else {"triggered": 0, "total_v": 0}
+    actions        = Counter(d.get("action") for d in hitl_decisions.values())
+    report_data = {
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "pipeline_summary": {
+            "rules_checked": len(violations),
+            "rules_triggered": kpis["triggered"],
+            "total_violations": kpis["total_v"],
+        },
+        "hitl_summary": {
+            "confirmed": actions["CONFIRMED"],
+            "dismissed": actions["DISMISSED"],
+            "escalated": actions["ESCALATED"],
+            "pending":   len(violations) - sum(v.get("rule_id") in hitl_decisions for v in violations),
+        },
+        "violations": violations,
+        "explanations": explanations,
+        "hitl_decisions": list(hitl_decisions.values()),
+    }
+    return orjson.dumps(report_data, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Pipeline log streaming: redraw the log box at most every 16 lines / 100 ms,
+# keeping only the tail it shows (a long run no longer grows an unbounded list)
+_HTML_ESC = str.maketrans({"<": "&lt;", ">": "&gt;"})
+_LOG_FLUSH_LINES = 16
+_LOG_FLUSH_SECS  = 0.1
+_LOG_TAIL_LINES  = 80
+
+
+def _pump_lines(stream, q: queue.Queue) -> None:
+    """Reader thread: forward subprocess output to the UI thread, then None at EOF."""
+    for line in stream:
+        q.put(line.rstrip())
+    q.put(None)
+
+
+def _render_log(area, log_lines: deque[str]) -> None:
+    area.markdown(
+        '<div class="log-box">' + "\n".join(log_lines).translate(_HTML_ESC) + "</div>",
+        unsafe_allow_html=True,
+    )
+
+
+# Rule fields shown in the rules tables → (column label, fill for missing keys)
+_RULE_TABLE_COLS = {
+    "id":              ("ID",          None),
+    "rule_type":       ("Type",        "—"),
+    "condition_field": ("Field",       "—"),
+    "operator":        ("Op",          "—"),
+    "threshold_value": ("Threshold",   "—"),
+    "description":     ("Description", ""),
+    "sql_hint":        ("SQL Hint",    ""),
+}
+
+
+def _rules_table(rules: list[dict], fields: list[str]) -> pd.DataFrame:
+    """Build a display table column-wise from rule dicts (no per-row dicts)."""
+    df = pd.DataFrame.from_records(rules, columns=fields)
+    df = df.fillna({f: _RULE_TABLE_COLS[f][1] for f in fields if _RULE_TABLE_COLS[f][1] is not None})
+    return df.rename(columns={f: _RULE_TABLE_COLS[f][0] for f in fields})
+
+
+_RULES_BROWSER_FIELDS = ["id", "rule_type", "condition_field", "operator", "threshold_value", "description", "sql_hint"]
+
+
+def _rules_browser_table(rules: list[dict]) -> pd.DataFrame:
+    """Rules tab table with the current report's violation count joined in."""
+    v_map = violation_count_map()
+    df = _rules_table(rules, _RULES_BROWSER_FIELDS)
+    df.insert(5, "Violations", [v_map.get(rule_id, "—") for rule_id in df["ID"]])
+    return df
+
+
+@st.cache_resource(max_entries=4)
+def _rules_html(rules_key: tuple | None, violations_key: tuple | None) -> str:
+    """
+    Unfiltered Rules tab table as static HTML, rebuilt only when either file
+    changes. Skips the Arrow/protobuf round trip of st.dataframe.
+    """
+    rules = (_parse_json_file(*rules_key) if rules_key else None) or []
+    df = _rules_browser_table(rules)
+    df["Violations"] = [f"{n:,}" if isinstance(n, int) else n for n in df["Violations"]]
+    html = df.to_html(index=False, classes="rules-tbl", border=0)
+    # Flatten indentation so markdown never reads a row as an indented code block
+    return '<div class="rules-tbl-wrap">' + "".join(l.strip() for l in html.splitlines()) + "</div>"
+
+
+# Badge colour per severity / query status / HITL decision (default "blue")
+_SEV_BADGE    = {"HIGH": "red", "MEDIUM": "amber", "LOW": "green", "CLEAR": "green"}
+_STATUS_BADGE = {"SUCCESS": "green", "BLOCKED": "red", "SQL_ERROR": "amber", "SKIPPED": "grey"}
+_HITL_BADGE   = {"CONFIRMED": "green", "DISMISSED": "grey", "ESCALATED": "red", "PENDING": "blue"}
+
+
 def severity_cls(count: int) -> str:
     if count == 0: return "clear"
     if count < 50: return "low"
@@ -290,15 +526,207 @@ def severity_cls(count: int) -> str:
     return "high"
 
 
+# One prefix per .badge-* class in assets/turgon.css
+_BADGE_PREFIX = {
+    s: f'<span class="badge badge-{s}">' for s in ("red", "amber", "green", "blue", "purple", "grey")
+}
+
+
+@lru_cache(maxsize=128)
 def badge(text: str, style: str) -> str:
-    return f'<span class="badge badge-{style}">{text}</span>'
+    prefix = _BADGE_PREFIX.get(style) or f'<span class="badge badge-{style}">'
+    return prefix + text + "</span>"
+
+
+# Card markup, filled with str.format_map. Kept unindented and free of blank
+# lines so markdown treats each card as one raw HTML block.
+_V_CARD_TMPL = (
+    '<div class="v-card {sev}">'
+    '<div class="v-header">'
+    '<span class="v-rule-id">{rule_id}</span>'
+    '<div style="display:flex;gap:.4rem;align-items:center;">{badges}</div>'
+    '</div>'
+    '<div class="v-desc">{description}</div>'
+    '<div class="v-footer">'
+    '<span class="v-count {sev}">{count:,}</span>'
+    '<span style="color:#6e7f8d;font-size:.82rem;margin-left:.3rem;">violations detected</span>'
+    '</div>'
+    '</div>'
+)
+_EXPLAIN_CARD_TMPL = (
+    '<div class="v-card {sev}">'
+    '<div class="v-header">'
+    '<span class="v-rule-id">{rule_id} — {headline}</span>'
+    '<div style="display:flex;gap:.4rem;">{badges}</div>'
+    '</div>'
+    '<div class="v-desc">{plain_english}</div>'
+    '<div class="v-footer">'
+    '<span class="v-count {sev}" style="font-size:1.1rem;">{count:,}</span>'
+    '<span style="color:#475569;font-size:.82rem;margin-left:.4rem;">violations</span>'
+    '</div>'
+    '<details style="margin-top:.6rem;padding:.3rem .6rem;">'
+    '<summary>📋 Recommended Action &amp; Policy Reference</summary>'
+    '<p><b>Recommended Action:</b> {action}</p>'
+    '<p><b>Policy Reference:</b> <i>{policy}</i></p>'
+    '</details>'
+    '</div>'
+)
+_RISK_ORDER = {"HIGH": 0, "MEDIUM": 1, "LOW": 2, "CLEAR": 3}
+_RISK_CARD  = {"HIGH": "high", "MEDIUM": "medium", "LOW": "low", "CLEAR": "clear"}
+
+
+def _one_line(text) -> str:
+    """
+    LLM/PDF-sourced card text, HTML-escaped (it lands in unsafe_allow_html
+    markup) with line breaks as <br>, so a blank line can't end the HTML block.
+    """
+    return html.escape(str(text)).replace("\r", "").replace("\n", "<br>")
+
+
+@st.cache_resource(max_entries=4)
+def _explanation_cards_html(path_str: str, mtime_ns: int, size: int) -> str:
+    """Every explanation card, highest risk first, as one HTML string."""
+    explanations = _parse_json_file(path_str, mtime_ns, size) or []
+    cards = []
+    for exp in sorted(explanations, key=lambda e: _RISK_ORDER.get(e.get("risk_level", "LOW"), 2)):
+        risk = exp.get("risk_level", "LOW")
+        llm  = exp.get("generated_by", "deterministic") == "llm"
+        cards.append(_EXPLAIN_CARD_TMPL.format_map({
+            "sev":           _RISK_CARD.get(risk, "low"),
+            "rule_id":       html.escape(str(exp.get("rule_id", "?"))),
+            "headline":      _one_line(exp.get("alert_headline", "")),
+            "badges":        badge(risk, _SEV_BADGE.get(risk, "blue"))
+                             + badge("🤖 AI" if llm else "⚙️ Deterministic", "blue" if llm else "grey"),
+            "plain_english": _one_line(exp.get("plain_english", "")),
+            "count":         exp.get("violation_count", 0),
+            "action":        _one_line(exp.get("recommended_action", "—")),
+            "policy":        _one_line(exp.get("policy_reference", "—")),
+        }))
+    return "\n".join(cards)
+
+
+# Plain lru_cache: a pure int → str, cheaper than st.cache_data's hashing/pickling
+@lru_cache(maxsize=8)
+def _fmt_last_run(mtime_ns: int) -> str:
+    return datetime.fromtimestamp(mtime_ns / 1e9).strftime("%d %b %Y · %H:%M:%S")
 
 
 def last_run_str() -> str:
-    if VIOLATION_JSON.exists():
-        t = VIOLATION_JSON.stat().st_mtime
-        return datetime.fromtimestamp(t).strftime("%d %b %Y · %H:%M:%S")
-    return "Never"
+    key = _file_key(VIOLATION_JSON)
+    return _fmt_last_run(key[1]) if key else "Never"
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Charts
+# ═══════════════════════════════════════════════════════════════════════════
+
+@st.cache_resource
+def _plotly():
+    """
+    Import plotly (~0.3-0.5 s cold) on first chart render, not at app load, and
+    register the shared "turgon" layout template in plotly's process-wide registry.
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    tpl = go.layout.Template(pio.templates["plotly_white"])
+    tpl.layout.update(
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(family="Inter", color="#1e293b"),
+    )
+    pio.templates["turgon"] = tpl
+    pio.templates.default = "turgon"
+    return go
+
+
+# Figures are keyed on the source file's _file_key() and held as shared
+# resources: a rerun on unchanged data reuses the same go.Figure instance
+# instead of unpickling a copy. Callers only pass them to st.plotly_chart.
+@st.cache_resource(max_entries=4)
+def _violations_bar_fig(path_str: str, mtime_ns: int, size: int) -> go.Figure:
+    go = _plotly()
+    vdf = (
+        pd.DataFrame.from_records(
+            _parse_violations_file(path_str, mtime_ns, size),
+            columns=["rule_id", "violation_count", "status"],
+        )
+        .fillna({"rule_id": "?", "violation_count": 0, "status": "?"})
+        .astype({"violation_count": "int64"})
+        .rename(columns={"rule_id": "Rule", "violation_count": "Violations", "status": "Status"})
+        .sort_values("Violations", ascending=True)
+    )
+
+    cnts   = vdf["Violations"].to_numpy()
+    colors = np.where(cnts >= 500, "#f85149", np.where(cnts >= 50, "#e3b341", "#3fb950")).tolist()
+
+    fig = go.Figure(go.Bar(
+        x=vdf["Violations"], y=vdf["Rule"],
+        orientation="h",
+        marker=dict(color=colors, line=dict(width=0)),
+        hovertemplate="<b>%{y}</b><br>Violations: %{x:,}<extra></extra>",
+    ))
+    fig.update_layout(
+        margin=dict(t=10, b=20, l=0, r=20),
+        height=360,
+        xaxis=dict(title="Violation Count", gridcolor="#e2e8f0", color="#475569"),
+        yaxis=dict(title=None, tickfont=dict(size=11, color="#1e293b")),
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=4)
+def _severity_pie_fig(path_str: str, mtime_ns: int, size: int) -> go.Figure:
+    go = _plotly()
+    kpis = _violation_kpis(path_str, mtime_ns, size)
+    sev_counts = {
+        "High (≥500)":     kpis["high_sev"],
+        "Medium (50-499)": kpis["medium"],
+        "Low (<50)":       kpis["low"],
+        "Clear":           kpis["clear"],
+    }
+    n_rules = len(_parse_violations_file(path_str, mtime_ns, size))
+
+    fig = go.Figure(go.Pie(
+        labels=list(sev_counts.keys()),
+        values=list(sev_counts.values()),
+        hole=0.55,
+        marker=dict(colors=["#f85149", "#e3b341", "#3fb950", "#1e2d40"]),
+        textfont=dict(color="#e6edf3"),
+    ))
+    fig.update_traces(
+        textinfo="percent+label",
+        hovertemplate="<b>%{label}</b><br>Rules: %{value}<extra></extra>",
+    )
+    fig.update_layout(
+        margin=dict(t=0, b=0, l=0, r=0),
+        height=300,
+        showlegend=False,
+        annotations=[dict(
+            text=f"<b>{n_rules}</b><br>rules",
+            x=.5, y=.5, font_size=16, showarrow=False, font_color="#0f172a",
+        )],
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=4)
+def _rule_types_pie_fig(path_str: str, mtime_ns: int, size: int) -> go.Figure:
+    go = _plotly()
+    rules = _parse_json_file(path_str, mtime_ns, size) or []
+    type_counts = Counter(r.get("rule_type", "unknown") for r in rules).most_common()
+    fig = go.Figure(go.Pie(
+        labels=[t for t, _ in type_counts],
+        values=[n for _, n in type_counts],
+        hole=0.5,
+        marker=dict(colors=["#58a6ff","#f85149","#e3b341","#3fb950","#bc8cff","#79c0ff"]),
+    ))
+    fig.update_traces(textinfo="percent", hovertemplate="<b>%{label}</b><br>Count: %{value}<extra></extra>")
+    fig.update_layout(
+        margin=dict(t=0, b=0, l=0, r=0),
+        height=220,
+        legend=dict(orientation="v", font=dict(size=11, color="#1e293b"), x=1.05),
+    )
+    return fig
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -356,7 +784,9 @@ with st.sidebar:
         run_btn = st.button("🚀 Run", width='stretch', type="primary")
     with c2:
         if st.button("🔄 Refresh", width='stretch'):
-            st.cache_data.clear()
+            # File-backed caches are keyed on mtime/size and refresh by
+            # themselves; only the TTL'd audit log needs an explicit clear.
+            load_audit_log.clear()
             st.rerun()
 
     st.divider()
@@ -365,9 +795,10 @@ with st.sidebar:
     rules      = load_rules()
     violations = load_violations()
 
-    total_v    = sum(v.get("violation_count", 0) for v in violations)
-    triggered  = sum(1 for v in violations if v.get("violation_count", 0) > 0)
-    high_sev   = sum(1 for v in violations if v.get("violation_count", 0) >= 500)
+    kpis       = compute_kpis()
+    total_v    = kpis["total_v"]
+    triggered  = kpis["triggered"]
+    high_sev   = kpis["high_sev"]
 
     st.markdown("### 📊 Current State")
     st.metric("Rules in store",        len(rules))
@@ -386,10 +817,7 @@ with st.sidebar:
         st.caption("No versions yet. Run Phase 1 to create the first snapshot.")
     else:
         # Build label options
-        version_labels = {
-            f"v{e['version']} — {e['timestamp'][:10]} ({e['rule_count']} rules) [{e['pdf_source']}]": e["version"]
-            for e in version_manifest
-        }
+        version_labels = _version_labels(_manifest_mtime())
         selected_label = st.selectbox(
             "Compare version",
             options=["▶ Current (live)"] + list(version_labels.keys()),
@@ -403,15 +831,15 @@ with st.sidebar:
             st.caption(f"Showing **v{selected_ver}** — {len(archived_rules)} rules")
 
             if archived_rules and rules:
-                current_fps  = {r.get("_fingerprint") for r in rules}
-                archived_fps = {r.get("_fingerprint") for r in archived_rules}
+                current_fps  = current_fingerprints()
+                archived_fps = _archived_fingerprints(selected_ver, _manifest_mtime())
                 added_count   = len(current_fps - archived_fps)
                 removed_count = len(archived_fps - current_fps)
                 col_a, col_b = st.columns(2)
                 col_a.metric("Added since", f"+{added_count}", delta=added_count if added_count else None)
                 col_b.metric("Removed since", f"-{removed_count}", delta=-removed_count if removed_count else None, delta_color="inverse")
 
-            if st.button("📋 Show archived rules", use_container_width=True):
+            if st.button("📋 Show archived rules", width='stretch'):
                 st.session_state["show_archived_version"] = selected_ver
         else:
             # Clear any previously pinned version view
@@ -429,7 +857,8 @@ if run_btn:
         pdf_path = None
         if uploaded_file:
             pdf_path = UPLOADS_DIR / uploaded_file.name
-            pdf_path.write_bytes(uploaded_file.read())
+            with pdf_path.open("wb") as out:
+                shutil.copyfileobj(uploaded_file, out, length=1024 * 1024)
 
         phase_flag = (
             "123" if "All Phases" in run_phase else
@@ -454,26 +883,43 @@ if run_btn:
         with prog_area.container():
             st.info(f"⏳ Running Phase {'1 + 2' if phase_flag == '12' else phase_flag}… this may take a few minutes.")
 
-        log_lines: list[str] = []
+        log_lines: deque[str] = deque(maxlen=_LOG_TAIL_LINES)
         with st.spinner(""):
             try:
+                # Unbuffered child + line-buffered pipe: output arrives as it is
+                # printed rather than in 8 KB bursts.
                 process = subprocess.Popen(
                     cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
                     text=True, cwd=str(ROOT), encoding="utf-8", errors="replace",
+                    bufsize=1, env={**os.environ, "PYTHONUNBUFFERED": "1"},
                 )
-                for line in process.stdout:  # type: ignore
-                    log_lines.append(line.rstrip())
-                    log_area.markdown(
-                        '<div class="log-box">' +
-                        "\n".join(log_lines[-80:]).replace("<", "&lt;").replace(">", "&gt;") +
-                        "</div>",
-                        unsafe_allow_html=True,
-                    )
+                # Read on a helper thread so a quiet pipeline still flushes
+                # the last partial batch within _LOG_FLUSH_SECS.
+                lines_q: queue.Queue[str | None] = queue.Queue()
+                threading.Thread(target=_pump_lines, args=(process.stdout, lines_q), daemon=True).start()
+                pending, last_flush, eof = 0, time.monotonic(), False
+                while not eof:
+                    try:
+                        line = lines_q.get(timeout=_LOG_FLUSH_SECS)
+                        # Drain everything already queued before deciding to redraw
+                        while True:
+                            if line is None:
+                                eof = True
+                                break
+                            log_lines.append(line)
+                            pending += 1
+                            line = lines_q.get_nowait()
+                    except queue.Empty:
+                        pass
+                    now = time.monotonic()
+                    if pending and (eof or pending >= _LOG_FLUSH_LINES or now - last_flush >= _LOG_FLUSH_SECS):
+                        _render_log(log_area, log_lines)
+                        pending, last_flush = 0, now
                 process.wait()
 
                 if process.returncode == 0:
                     prog_area.success("✅ Pipeline completed! Reloading dashboard…")
-                    st.cache_data.clear()
+                    load_audit_log.clear()
                     time.sleep(1.5)
                     st.rerun()
                 else:
@@ -498,10 +944,11 @@ tab_overview, tab_rules, tab_violations, tab_explain, tab_hitl_log = st.tabs([
 # ── TAB 1: Overview ─────────────────────────────────────────────────────────
 with tab_overview:
     total_rules  = len(rules)
-    total_v      = sum(v.get("violation_count", 0) for v in violations)
-    triggered    = sum(1 for v in violations if v.get("violation_count", 0) > 0)
-    high_sev     = sum(1 for v in violations if v.get("violation_count", 0) >= 500)
-    blocked      = sum(1 for v in violations if v.get("status") == "BLOCKED")
+    kpis         = compute_kpis()
+    total_v      = kpis["total_v"]
+    triggered    = kpis["triggered"]
+    high_sev     = kpis["high_sev"]
+    blocked      = kpis["blocked"]
 
     # KPI row
     st.markdown(f"""
@@ -540,100 +987,20 @@ with tab_overview:
     """, unsafe_allow_html=True)
 
     if violations:
-        import plotly.graph_objects as go
-        import plotly.express as px
-
         col_left, col_right = st.columns([3, 2])
 
         with col_left:
             st.markdown('<div class="sec-head">📊 Violations by Rule</div>', unsafe_allow_html=True)
-            vdf = pd.DataFrame([
-                {
-                    "Rule": v.get("rule_id", "?"),
-                    "Violations": v.get("violation_count", 0),
-                    "Status": v.get("status", "?"),
-                }
-                for v in violations
-            ]).sort_values("Violations", ascending=True)
-
-            colors = []
-            for cnt in vdf["Violations"]:
-                if cnt >= 500: colors.append("#f85149")
-                elif cnt >= 50: colors.append("#e3b341")
-                else: colors.append("#3fb950")
-
-            fig = go.Figure(go.Bar(
-                x=vdf["Violations"], y=vdf["Rule"],
-                orientation="h",
-                marker=dict(color=colors, line=dict(width=0)),
-                hovertemplate="<b>%{y}</b><br>Violations: %{x:,}<extra></extra>",
-            ))
-            fig.update_layout(
-                template="plotly_white",
-                paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
-                margin=dict(t=10, b=20, l=0, r=20),
-                height=360,
-                xaxis=dict(title="Violation Count", gridcolor="#e2e8f0", color="#475569"),
-                yaxis=dict(title=None, tickfont=dict(size=11, color="#1e293b")),
-                font=dict(family="Inter", color="#1e293b"),
-            )
-            st.plotly_chart(fig, width='stretch')
+            st.plotly_chart(_violations_bar_fig(*_file_key(VIOLATION_JSON)), width='stretch')
 
         with col_right:
             st.markdown('<div class="sec-head">🔵 Severity Distribution</div>', unsafe_allow_html=True)
-            sev_counts = {"High (≥500)": 0, "Medium (50-499)": 0, "Low (<50)": 0, "Clear": 0}
-            for v in violations:
-                c = v.get("violation_count", 0)
-                if c >= 500: sev_counts["High (≥500)"] += 1
-                elif c >= 50: sev_counts["Medium (50-499)"] += 1
-                elif c > 0:  sev_counts["Low (<50)"] += 1
-                else:        sev_counts["Clear"] += 1
-
-            fig2 = go.Figure(go.Pie(
-                labels=list(sev_counts.keys()),
-                values=list(sev_counts.values()),
-                hole=0.55,
-                marker=dict(colors=["#f85149", "#e3b341", "#3fb950", "#1e2d40"]),
-                textfont=dict(color="#e6edf3"),
-            ))
-            fig2.update_traces(
-                textinfo="percent+label",
-                hovertemplate="<b>%{label}</b><br>Rules: %{value}<extra></extra>",
-            )
-            fig2.update_layout(
-                template="plotly_white",
-                paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
-                margin=dict(t=0, b=0, l=0, r=0),
-                height=300,
-                showlegend=False,
-                font=dict(family="Inter", color="#1e293b"),
-                annotations=[dict(
-                    text=f"<b>{len(violations)}</b><br>rules",
-                    x=.5, y=.5, font_size=16, showarrow=False, font_color="#0f172a",
-                )],
-            )
-            st.plotly_chart(fig2, width='stretch')
+            st.plotly_chart(_severity_pie_fig(*_file_key(VIOLATION_JSON)), width='stretch')
 
             # Rule type donut
             if rules:
                 st.markdown('<div class="sec-head" style="margin-top:.5rem;">📦 Rule Types</div>', unsafe_allow_html=True)
-                type_counts = pd.Series([r.get("rule_type", "unknown") for r in rules]).value_counts()
-                fig3 = go.Figure(go.Pie(
-                    labels=type_counts.index.tolist(),
-                    values=type_counts.values.tolist(),
-                    hole=0.5,
-                    marker=dict(colors=["#58a6ff","#f85149","#e3b341","#3fb950","#bc8cff","#79c0ff"]),
-                ))
-                fig3.update_traces(textinfo="percent", hovertemplate="<b>%{label}</b><br>Count: %{value}<extra></extra>")
-                fig3.update_layout(
-                    template="plotly_white",
-                    paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
-                    margin=dict(t=0, b=0, l=0, r=0),
-                    height=220,
-                    font=dict(family="Inter", color="#1e293b"),
-                    legend=dict(orientation="v", font=dict(size=11, color="#1e293b"), x=1.05),
-                )
-                st.plotly_chart(fig3, width='stretch')
+                st.plotly_chart(_rule_types_pie_fig(*_file_key(RULES_JSON)), width='stretch')
 
     else:
         st.markdown("""
@@ -645,6 +1012,46 @@ with tab_overview:
         """, unsafe_allow_html=True)
 
 
+# Search/filter widgets live in a fragment: typing in the search box or
+# changing a filter reruns only this table, not the whole dashboard.
+@st.fragment
+def _rules_browser(rules: list[dict]) -> None:
+    rules_key = _file_key(RULES_JSON)
+    type_opts, op_opts = _rules_filter_options(*rules_key)
+    col_s, col_t, col_op = st.columns([3, 1.5, 1.5])
+    with col_s:
+        search = st.text_input("🔍 Search rules", placeholder="threshold, bank, currency…", label_visibility="collapsed")
+    with col_t:
+        sel_type  = st.selectbox("Type", type_opts, label_visibility="collapsed")
+    with col_op:
+        sel_op = st.selectbox("Operator", op_opts, label_visibility="collapsed")
+
+    filters   = (search.lower(), sel_type, sel_op)
+    filtered  = _filtered_rules(rules_key, *filters)
+
+    st.caption(f"Showing **{len(filtered)}** of **{len(rules)}** rules")
+
+    if filters == ("", "All types", "All"):
+        # No filter active: serve the cached static table
+        st.markdown(_rules_html(_file_key(RULES_JSON), _file_key(VIOLATION_JSON)), unsafe_allow_html=True)
+    else:
+        st.dataframe(
+            _rules_browser_table(filtered), width='stretch', hide_index=True,
+            column_config={
+                "Description": st.column_config.TextColumn(width="large"),
+                "SQL Hint": st.column_config.TextColumn(width="medium"),
+                "Violations": st.column_config.NumberColumn(format="%d"),
+            },
+        )
+
+    c1, c2 = st.columns([1, 5])
+    with c1:
+        st.download_button(
+            "⬇️ Export JSON", data=_rules_json_blob(rules_key, *filters),
+            file_name="turgon_rules.json", mime="application/json",
+        )
+
+
 # ── TAB 2: Policy Rules ──────────────────────────────────────────────────────
 with tab_rules:
     # ── Archived version viewer (shown when user selects a version in sidebar) ─
@@ -654,22 +1061,15 @@ with tab_rules:
         st.info(f"📦 Viewing archived **v{pinned_ver}** — {len(archived_rules)} rules  ·  "
                 f"[Click **▶ Current (live)** in sidebar to return to live view]")
         if archived_rules:
-            arch_df = pd.DataFrame([
-                {
-                    "ID":          r.get("id"),
-                    "Type":        r.get("rule_type", "—"),
-                    "Field":       r.get("condition_field", "—"),
-                    "Op":          r.get("operator", "—"),
-                    "Threshold":   r.get("threshold_value", "—"),
-                    "Description": r.get("description", ""),
-                }
-                for r in archived_rules
-            ])
-            st.dataframe(arch_df, use_container_width=True, hide_index=True,
+            arch_df = _rules_table(
+                archived_rules,
+                ["id", "rule_type", "condition_field", "operator", "threshold_value", "description"],
+            )
+            st.dataframe(arch_df, width='stretch', hide_index=True,
                          column_config={"Description": st.column_config.TextColumn(width="large")})
             st.download_button(
                 f"⬇️ Export v{pinned_ver} JSON",
-                data=json.dumps(archived_rules, indent=2),
+                data=_archived_rules_json(pinned_ver, _manifest_mtime()),
                 file_name=f"turgon_rules_v{pinned_ver}.json",
                 mime="application/json",
             )
@@ -678,59 +1078,7 @@ with tab_rules:
     if not rules:
         st.info("No policy rules extracted yet. Upload a regulatory PDF and run Phase 1.")
     else:
-        col_s, col_t, col_op = st.columns([3, 1.5, 1.5])
-        with col_s:
-            search = st.text_input("🔍 Search rules", placeholder="threshold, bank, currency…", label_visibility="collapsed")
-        with col_t:
-            type_opts = ["All types"] + sorted(set(r.get("rule_type", "unknown") for r in rules))
-            sel_type  = st.selectbox("Type", type_opts, label_visibility="collapsed")
-        with col_op:
-            sel_op = st.selectbox("Operator", ["All"] + sorted(set(r.get("operator", "?") for r in rules)), label_visibility="collapsed")
-
-        filtered = rules
-        if search:
-            s = search.lower()
-            filtered = [r for r in filtered if s in r.get("description","").lower()
-                        or s in r.get("condition_field","").lower()
-                        or s in r.get("sql_hint","").lower()]
-        if sel_type != "All types":
-            filtered = [r for r in filtered if r.get("rule_type") == sel_type]
-        if sel_op != "All":
-            filtered = [r for r in filtered if r.get("operator") == sel_op]
-
-        # join violation counts
-        v_map = {v.get("rule_id"): v.get("violation_count", 0) for v in violations}
-
-        st.caption(f"Showing **{len(filtered)}** of **{len(rules)}** rules")
-
-        df = pd.DataFrame([
-            {
-                "ID": r.get("id"),
-                "Type": r.get("rule_type","—"),
-                "Field": r.get("condition_field","—"),
-                "Op": r.get("operator","—"),
-                "Threshold": r.get("threshold_value","—"),
-                "Violations": v_map.get(r.get("id",""), "—"),
-                "Description": r.get("description",""),
-                "SQL Hint": r.get("sql_hint",""),
-            }
-            for r in filtered
-        ])
-        st.dataframe(
-            df, width='stretch', hide_index=True,
-            column_config={
-                "Description": st.column_config.TextColumn(width="large"),
-                "SQL Hint": st.column_config.TextColumn(width="medium"),
-                "Violations": st.column_config.NumberColumn(format="%d"),
-            },
-        )
-
-        c1, c2 = st.columns([1, 5])
-        with c1:
-            st.download_button(
-                "⬇️ Export JSON", data=json.dumps(filtered, indent=2),
-                file_name="turgon_rules.json", mime="application/json",
-            )
+        _rules_browser(rules)
 
 
 # ── TAB 3: Violations ────────────────────────────────────────────────────────
@@ -750,18 +1098,55 @@ with tab_violations:
         with col_f3:
             sort_by = st.selectbox("Sort", ["Violations ↓", "Violations ↑", "Rule ID"], label_visibility="collapsed")
 
-        # Sort
+        # Filter the whole report with one mask first, then sort only the
+        # survivors. Positions (not dicts) keep duplicate rule ids distinct.
+        violations_key = _file_key(VIOLATION_JSON)
+        counts, sev_labels = _severity_vectors(*violations_key)
+        keep = np.isin(sev_labels, sev_filter)
+        if show_only:
+            keep &= counts > 0
+        kept = np.flatnonzero(keep)
         if sort_by == "Violations ↓":
-            display_v = sorted(violations, key=lambda x: x.get("violation_count", 0), reverse=True)
+            kept = kept[np.argsort(-counts[kept], kind="stable")]
         elif sort_by == "Violations ↑":
-            display_v = sorted(violations, key=lambda x: x.get("violation_count", 0))
+            kept = kept[np.argsort(counts[kept], kind="stable")]
         else:
-            display_v = sorted(violations, key=lambda x: x.get("rule_id", ""))
+            kept = sorted(kept, key=lambda i: violations[i].get("rule_id", ""))
+        shown_pos = [int(i) for i in kept]
 
-        st.divider()
-        all_rows = []
+        # One virtualised table instead of a card + buttons + expanders per rule
+        hitl_decisions = load_hitl_decisions()
+        shown = [violations[i] for i in shown_pos]
+        all_samples = _samples_frame(*violations_key)
+
+        vt = pd.DataFrame({
+            "Rule":        [v.get("rule_id", "?") for v in shown],
+            "Severity":    sev_labels[shown_pos],
+            "Status":      [v.get("status", "?") for v in shown],
+            "Violations":  [v.get("violation_count", 0) for v in shown],
+            "HITL":        [hitl_decisions.get(v.get("rule_id", "?"), {}).get("action", "PENDING") for v in shown],
+            "Description": [v.get("rule_description", "No description") for v in shown],
+        })
+        # Row selections are positional, so key the table on the report version
+        # and the filter/sort: any change that reorders rows starts a fresh
+        # selection instead of pointing a stale index at a different rule.
+        table_key = f"violations_table:{violations_key[1]}:{int(show_only)}:{','.join(sev_filter)}:{sort_by}"
+        event = st.dataframe(
+            vt, key=table_key, on_select="rerun", selection_mode="single-row",
+            width='stretch', hide_index=True,
+            column_config={
+                "Violations": st.column_config.NumberColumn(format="%d"),
+                "Description": st.column_config.TextColumn(width="large"),
+            },
+        )
 
-        for idx, v in enumerate(display_v):
+        st.divider()
+        selected = [i for i in event.selection.rows if i < len(shown_pos)]
+        if not selected:
+            st.caption("Select a rule in the table to review its samples and record a decision.")
+        else:
+            pos = shown_pos[selected[0]]
+            v = violations[pos]
             rule_id     = v.get("rule_id", "?")
             description = v.get("rule_description", "No description")
             count       = v.get("violation_count", 0)
@@ -770,81 +1155,54 @@ with tab_violations:
             samples     = v.get("sample_violations", [])
 
             sev = severity_cls(count)
-            sev_label = {"high": "HIGH", "medium": "MEDIUM", "low": "LOW", "clear": "CLEAR"}[sev]
+            sev_label = sev.upper()
 
-            if show_only and count == 0: continue
-            if sev_label not in sev_filter: continue
-
-            badge_sev_color = {"HIGH": "red", "MEDIUM": "amber", "LOW": "green", "CLEAR": "green"}.get(sev_label, "blue")
-            status_color    = {"SUCCESS": "green", "BLOCKED": "red", "SQL_ERROR": "amber", "SKIPPED": "grey"}.get(status, "blue")
+            badge_sev_color = _SEV_BADGE.get(sev_label, "blue")
+            status_color    = _STATUS_BADGE.get(status, "blue")
 
             # HITL decision badge
-            hitl_decisions = load_hitl_decisions()
             current_decision = hitl_decisions.get(rule_id, {}).get("action", "PENDING")
-            hitl_color = {"CONFIRMED": "green", "DISMISSED": "grey", "ESCALATED": "red", "PENDING": "blue"}.get(current_decision, "blue")
-
-            st.markdown(f"""
-            <div class="v-card {sev}">
-              <div class="v-header">
-                <span class="v-rule-id">{rule_id}</span>
-                <div style="display:flex;gap:.4rem;align-items:center;">
-                  {badge(sev_label, badge_sev_color)}
-                  {badge(status, status_color)}
-                  {badge('👤 ' + current_decision, hitl_color)}
-                </div>
-              </div>
-              <div class="v-desc">{description}</div>
-              <div class="v-footer">
-                <span class="v-count {sev}">{count:,}</span>
-                <span style="color:#6e7f8d;font-size:.82rem;margin-left:.3rem;">violations detected</span>
-              </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-            # HITL action buttons
-            b1, b2, b3, b4 = st.columns([1, 1, 1, 3])
-            with b1:
-                if st.button("✅ Confirm", key=f"confirm_{rule_id}_{idx}"):
-                    from hitl import save_decision
-                    from audit import log_hitl_decision
-                    save_decision(rule_id, "CONFIRMED")
-                    log_hitl_decision(rule_id, "CONFIRMED", "analyst", "")
-                    st.cache_data.clear()
-                    st.rerun()
-            with b2:
-                if st.button("❌ Dismiss", key=f"dismiss_{rule_id}_{idx}"):
-                    from hitl import save_decision
-                    from audit import log_hitl_decision
-                    save_decision(rule_id, "DISMISSED")
-                    log_hitl_decision(rule_id, "DISMISSED", "analyst", "")
-                    st.cache_data.clear()
-                    st.rerun()
-            with b3:
-                if st.button("🚨 Escalate", key=f"escalate_{rule_id}_{idx}"):
-                    from hitl import save_decision
-                    from audit import log_hitl_decision
-                    save_decision(rule_id, "ESCALATED")
-                    log_hitl_decision(rule_id, "ESCALATED", "analyst", "Escalated for senior review")
-                    st.cache_data.clear()
-                    st.rerun()
+            hitl_color = _HITL_BADGE.get(current_decision, "blue")
+
+            st.markdown(_V_CARD_TMPL.format_map({
+                "sev":         sev,
+                "rule_id":     html.escape(str(rule_id)),
+                "badges":      badge(sev_label, badge_sev_color)
+                               + badge(status, status_color)
+                               + badge("👤 " + current_decision, hitl_color),
+                "description": _one_line(description),
+                "count":       count,
+            }), unsafe_allow_html=True)
+
+            # HITL decision control
+            st.segmented_control(
+                "Decision", list(_HITL_ACTIONS), key=f"hitl_{rule_id}",
+                default=_HITL_LABELS.get(current_decision),
+                on_change=_apply_hitl, args=(rule_id,), label_visibility="collapsed",
+            )
 
             if samples:
                 with st.expander(f"🔍 View sample violations ({min(len(samples),5)} shown)"):
-                    st.dataframe(pd.DataFrame(samples[:5]), width='stretch', hide_index=True)
+                    sample_df = (
+                        all_samples.loc[[pos]]
+                        .drop(columns=["rule_id", "severity"])
+                        .dropna(axis=1, how="all")
+                        .head(5)
+                    )
+                    st.dataframe(sample_df, width='stretch', hide_index=True)
 
             if sql:
                 with st.expander("🔧 View SQL used"):
                     st.code(sql, language="sql")
 
             st.divider()
-            for row in samples:
-                all_rows.append({"rule_id": rule_id, "severity": sev_label, **row})
 
-        if all_rows:
-            export_df = pd.DataFrame(all_rows)
+        with_samples = set(all_samples.index)
+        export_pos = tuple(i for i in shown_pos if i in with_samples)
+        if export_pos:
             st.download_button(
                 "⬇️ Export All Violations (CSV)",
-                data=export_df.to_csv(index=False),
+                data=_violations_csv(*_file_key(VIOLATION_JSON), export_pos),
                 file_name=f"turgon_violations_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
                 mime="text/csv",
                 width='stretch',
@@ -869,44 +1227,14 @@ with tab_explain:
         col_c.metric("AI Generated", sum(1 for e in explanations if e.get("generated_by") == "llm"))
 
         st.divider()
-        risk_order = {"HIGH": 0, "MEDIUM": 1, "LOW": 2, "CLEAR": 3}
-        sorted_exps = sorted(explanations, key=lambda e: risk_order.get(e.get("risk_level", "LOW"), 2))
-
-        for exp in sorted_exps:
-            risk  = exp.get("risk_level", "LOW")
-            rid   = exp.get("rule_id", "?")
-            count = exp.get("violation_count", 0)
-            gen   = exp.get("generated_by", "deterministic")
-
-            sev_card = {"HIGH": "high", "MEDIUM": "medium", "LOW": "low", "CLEAR": "clear"}.get(risk, "low")
-            risk_badge_color = {"HIGH": "red", "MEDIUM": "amber", "LOW": "green", "CLEAR": "green"}.get(risk, "blue")
-            gen_badge = badge("🤖 AI" if gen == "llm" else "⚙️ Deterministic", "blue" if gen == "llm" else "grey")
-
-            st.markdown(f"""
-            <div class="v-card {sev_card}">
-              <div class="v-header">
-                <span class="v-rule-id">{rid} — {exp.get('alert_headline', '')}</span>
-                <div style="display:flex;gap:.4rem;">
-                  {badge(risk, risk_badge_color)}
-                  {gen_badge}
-                </div>
-              </div>
-              <div class="v-desc">{exp.get('plain_english', '')}</div>
-              <div class="v-footer">
-                <span class="v-count {sev_card}" style="font-size:1.1rem;">{count:,}</span>
-                <span style="color:#475569;font-size:.82rem;margin-left:.4rem;">violations</span>
-              </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-            with st.expander("📋 Recommended Action & Policy Reference"):
-                st.markdown(f"**Recommended Action:** {exp.get('recommended_action', '—')}")
-                st.markdown(f"**Policy Reference:** *{exp.get('policy_reference', '—')}*")
+        # All cards in one markdown element; action/policy sit in native <details>
+        st.markdown(_explanation_cards_html(*_file_key(EXPLANATIONS_JSON)), unsafe_allow_html=True)
 
         st.divider()
         st.download_button(
             "⬇️ Export Explanations (JSON)",
-            data=json.dumps(explanations, indent=2),
+            # Phase 3 writes this file as indented JSON already — hand over its bytes
+            data=_file_bytes(*_file_key(EXPLANATIONS_JSON)),
             file_name=f"turgon_explanations_{datetime.now().strftime('%Y%m%d_%H%M')}.json",
             mime="application/json",
         )
@@ -926,8 +1254,7 @@ with tab_hitl_log:
         else:
             audit_stats_col1, audit_stats_col2, audit_stats_col3 = st.columns(3)
             try:
-                from audit import get_stats
-                stats = get_stats()
+                stats = _audit.get_stats()
                 audit_stats_col1.metric("Total Events", stats.get("total_events", 0))
                 audit_stats_col2.metric("Pipeline Runs", stats.get("pipeline_runs", 0))
                 audit_stats_col3.metric("HITL Decisions", stats.get("hitl_decisions", 0))
@@ -942,19 +1269,24 @@ with tab_hitl_log:
                 "HITL_ESCALATED": "🚨",
                 "EXPLANATION_RUN": "🤖",
             }
-            for row in audit_rows:
-                icon = event_icons.get(row.get("event_type", ""), "📌")
-                ts   = row.get("ts", "")[:19].replace("T", " ")
-                evtype = row.get("event_type", "")
-                rid  = row.get("rule_id") or "—"
-                phase = row.get("phase", "")
-                try:
-                    details = json.loads(row.get("details_json") or "{}")
-                except Exception:
-                    details = {}
-
-                with st.expander(f"{icon} [{ts} UTC] {phase} · {evtype} · rule: {rid}"):
-                    st.json(details)
+            # One table + a single detail panel; expanders would all re-render every rerun
+            log_df = pd.DataFrame({
+                "":      [event_icons.get(r.get("event_type", ""), "📌") for r in audit_rows],
+                "Time (UTC)": [r.get("ts", "")[:19].replace("T", " ") for r in audit_rows],
+                "Phase": [r.get("phase", "") for r in audit_rows],
+                "Event": [r.get("event_type", "") for r in audit_rows],
+                "Rule":  [r.get("rule_id") or "—" for r in audit_rows],
+            })
+            # Newest first, so a new event shifts every row: key the selection on
+            # the newest id so it resets rather than pointing at another event
+            log_event = st.dataframe(
+                log_df, key=f"audit_table:{audit_rows[0].get('id')}", on_select="rerun", selection_mode="single-row",
+                width='stretch', hide_index=True,
+            )
+            if log_sel := [i for i in log_event.selection.rows if i < len(audit_rows)]:
+                st.json(audit_rows[log_sel[0]].get("details", {}))
+            else:
+                st.caption("Select an event to view its details.")
 
     with col_right:
         st.markdown('<div class="sec-head">🔐 SQL Audit</div>', unsafe_allow_html=True)
@@ -962,16 +1294,25 @@ with tab_hitl_log:
 
         if violations:
             status_icons = {"SUCCESS": "✅", "BLOCKED": "🚫", "SQL_ERROR": "❌", "SKIPPED": "⏭️"}
-            for v in violations:
-                rid    = v.get("rule_id", "?")
-                sql    = v.get("sql", "No SQL recorded")
-                status = v.get("status", "?")
-                count  = v.get("violation_count", 0)
-                icon   = status_icons.get(status, "⚠️")
-                with st.expander(f"{icon} {rid} — {count:,} hits — {status}"):
-                    st.code(sql, language="sql")
-                    if v.get("reason"):
-                        st.warning(f"Reason: {v['reason']}")
+            sql_df = pd.DataFrame({
+                "":       [status_icons.get(v.get("status", "?"), "⚠️") for v in violations],
+                "Rule":   [v.get("rule_id", "?") for v in violations],
+                "Status": [v.get("status", "?") for v in violations],
+                "Hits":   [v.get("violation_count", 0) for v in violations],
+            })
+            # Keyed on the report version: a pipeline re-run starts a fresh selection
+            sql_event = st.dataframe(
+                sql_df, key=f"sql_audit_table:{_file_key(VIOLATION_JSON)[1]}", on_select="rerun", selection_mode="single-row",
+                width='stretch', hide_index=True,
+                column_config={"Hits": st.column_config.NumberColumn(format="%d")},
+            )
+            if sql_sel := [i for i in sql_event.selection.rows if i < len(violations)]:
+                v = violations[sql_sel[0]]
+                st.code(v.get("sql", "No SQL recorded"), language="sql")
+                if v.get("reason"):
+                    st.warning(f"Reason: {v['reason']}")
+            else:
+                st.caption("Select a rule to view its validated SQL.")
         else:
             st.info("No SQL audit log yet.")
 
@@ -979,28 +1320,14 @@ with tab_hitl_log:
         st.markdown('<div class="sec-head">📄 Compliance Report</div>', unsafe_allow_html=True)
 
         # Generate compliance report on demand
-        hitl_decisions = load_hitl_decisions()
         if violations:
-            report_data = {
-                "generated_at": datetime.utcnow().isoformat() + "Z",
-                "pipeline_summary": {
-                    "rules_checked": len(violations),
-                    "rules_triggered": sum(1 for v in violations if v.get("violation_count", 0) > 0),
-                    "total_violations": sum(v.get("violation_count", 0) for v in violations),
-                },
-                "hitl_summary": {
-                    "confirmed": sum(1 for d in hitl_decisions.values() if d.get("action") == "CONFIRMED"),
-                    "dismissed": sum(1 for d in hitl_decisions.values() if d.get("action") == "DISMISSED"),
-                    "escalated": sum(1 for d in hitl_decisions.values() if d.get("action") == "ESCALATED"),
-                    "pending":   sum(1 for v in violations if v.get("rule_id") not in hitl_decisions),
-                },
-                "violations": violations,
-                "explanations": explanations,
-                "hitl_decisions": list(hitl_decisions.values()),
-            }
             st.download_button(
                 "⬇️ Download Compliance Report",
-                data=json.dumps(report_data, indent=2, ensure_ascii=False),
+                data=_compliance_report_json(
+                    _file_key(VIOLATION_JSON),
+                    _file_key(_hitl.HITL_JSON) if _hitl else None,
+                    _file_key(EXPLANATIONS_JSON),
+                ),
                 file_name=f"turgon_compliance_report_{datetime.now().strftime('%Y%m%d_%H%M')}.json",
                 mime="application/json",
                 width="stretch",
@@ -8,97 +8,140 @@ Never UPDATE or DELETE — only INSERT.
 """
 from __future__ import annotations
 
-import json
 import sqlite3
-from datetime import datetime
+import threading
+import time
 from pathlib import Path
 
+import orjson
+
 ROOT      = Path(__file__).parent.resolve()
 AUDIT_DB  = ROOT / "rules" / "audit.db"
 AUDIT_DB.parent.mkdir(parents=True, exist_ok=True)
 
+# One process-wide connection, opened lazily. The dashboard calls in from
+# several Streamlit script threads, so every use goes through _lock.
+_conn: sqlite3.Connection | None = None
+_lock = threading.Lock()
+
+# The only write statement. One constant text for both writers, so sqlite3's
+# per-connection statement cache compiles it once and reuses it.
+_INSERT_SQL = "INSERT INTO audit_log(ts, phase, event_type, rule_id, details_json) VALUES(?,?,?,?,?)"
+
 
 def _connect() -> sqlite3.Connection:
-    conn = sqlite3.connect(str(AUDIT_DB))
-    conn.row_factory = sqlite3.Row
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS audit_log (
-            id           INTEGER PRIMARY KEY AUTOINCREMENT,
-            ts           TEXT    NOT NULL,
-            phase        TEXT    NOT NULL,
-            event_type   TEXT    NOT NULL,
-            rule_id      TEXT,
-            details_json TEXT
+    """Return the shared connection, creating it (and the schema) on first use."""
+    global _conn
+    if _conn is None:
+        conn = sqlite3.connect(str(AUDIT_DB), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS audit_log (
+                id           INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts           TEXT    NOT NULL,
+                phase        TEXT    NOT NULL,
+                event_type   TEXT    NOT NULL,
+                rule_id      TEXT,
+                details_json TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_audit_event_type ON audit_log(event_type)")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_audit_rule_id ON audit_log(rule_id) "
+            "WHERE rule_id IS NOT NULL"
+        )
+        conn.commit()
+        _conn = conn
+    return _conn
+
+
+def _insert(phase: str, event_type: str, rule_id: str | None, details: dict) -> None:
+    with _lock:
+        conn = _connect()
+        conn.execute(
+            _INSERT_SQL,
+            (_now(), phase, event_type, rule_id, orjson.dumps(details).decode()),
         )
-    """)
-    conn.commit()
-    return conn
+        conn.commit()
 
 
 def _now() -> str:
-    return datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    # C-level strftime on a struct_time; no datetime object per audit row
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
 # ── Public writers ─────────────────────────────────────────────────────────────
 
 def log_pipeline_run(phase: int, duration_s: float, stats: dict) -> None:
     """Log a pipeline phase completion event."""
-    conn = _connect()
-    conn.execute(
-        "INSERT INTO audit_log(ts, phase, event_type, rule_id, details_json) VALUES(?,?,?,?,?)",
-        (_now(), f"Phase {phase}", "PIPELINE_RUN", None, json.dumps(stats)),
-    )
-    conn.commit()
-    conn.close()
+    _insert(f"Phase {phase}", "PIPELINE_RUN", None, stats)
 
 
 def log_hitl_decision(rule_id: str, action: str, analyst: str, notes: str) -> None:
     """Log a human analyst decision."""
-    conn = _connect()
-    conn.execute(
-        "INSERT INTO audit_log(ts, phase, event_type, rule_id, details_json) VALUES(?,?,?,?,?)",
-        (
-            _now(),
-            "Phase 3",
-            f"HITL_{action}",
-            rule_id,
-            json.dumps({"analyst": analyst, "notes": notes, "action": action}),
-        ),
+    _insert(
+        "Phase 3", f"HITL_{action}", rule_id,
+        {"analyst": analyst, "notes": notes, "action": action},
     )
-    conn.commit()
-    conn.close()
+
+
+def log_hitl_decisions_bulk(decisions: list[dict]) -> None:
+    """
+    Log many analyst decisions in one transaction (one commit instead of N).
+
+    Each item needs rule_id, action and analyst; notes is optional.
+    """
+    rows = [
+        (
+            _now(), "Phase 3", f"HITL_{d['action']}", d["rule_id"],
+            orjson.dumps({"analyst": d["analyst"], "notes": d.get("notes", ""), "action": d["action"]}).decode(),
+        )
+        for d in decisions
+    ]
+    if not rows:
+        return
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.executemany(
+                _INSERT_SQL,
+                rows,
+            )
 
 
 def log_explanation_run(rule_count: int, duration_s: float) -> None:
     """Log a Phase 3 explanation generation run."""
-    conn = _connect()
-    conn.execute(
-        "INSERT INTO audit_log(ts, phase, event_type, rule_id, details_json) VALUES(?,?,?,?,?)",
-        (
-            _now(), "Phase 3", "EXPLANATION_RUN", None,
-            json.dumps({"rules_explained": rule_count, "duration_s": round(duration_s, 2)}),
-        ),
+    _insert(
+        "Phase 3", "EXPLANATION_RUN", None,
+        {"rules_explained": rule_count, "duration_s": round(duration_s, 2)},
     )
-    conn.commit()
-    conn.close()
 
 
 # ── Public readers ─────────────────────────────────────────────────────────────
 
 def get_log(limit: int = 200) -> list[dict]:
     """Return the most recent audit log entries (newest first)."""
-    conn = _connect()
-    rows = conn.execute(
-        "SELECT * FROM audit_log ORDER BY id DESC LIMIT ?", (limit,)
-    ).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    with _lock:
+        cur = _connect().execute(
+            "SELECT * FROM audit_log ORDER BY id DESC LIMIT ?", (limit,)
+        )
+        # Plain tuples + one zip per row: no sqlite3.Row wrapper to copy out of
+        cols = [d[0] for d in cur.description]
+        rows = cur.fetchall()
+    return [dict(zip(cols, r)) for r in rows]
 
 
 def get_stats() -> dict:
-    conn = _connect()
-    total     = conn.execute("SELECT COUNT(*) FROM audit_log").fetchone()[0]
-    runs      = conn.execute("SELECT COUNT(*) FROM audit_log WHERE event_type='PIPELINE_RUN'").fetchone()[0]
-    decisions = conn.execute("SELECT COUNT(*) FROM audit_log WHERE event_type LIKE 'HITL_%'").fetchone()[0]
-    conn.close()
-    return {"total_events": total, "pipeline_runs": runs, "hitl_decisions": decisions}
+    with _lock:
+        # One pass over idx_audit_event_type (it covers the query) yields every
+        # per-type count; the handful of distinct types are summed in Python.
+        counts = dict(_connect().execute(
+            "SELECT event_type, COUNT(*) FROM audit_log GROUP BY event_type"
+        ).fetchall())
+    return {
+        "total_events":   sum(counts.values()),
+        "pipeline_runs":  counts.get("PIPELINE_RUN", 0),
+        "hitl_decisions": sum(n for t, n in counts.items() if t.startswith("HITL_")),
+    }
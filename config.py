@@ -5,7 +5,9 @@ All constants and environment loading live here.
 Other modules import from this file; never import dotenv elsewhere.
 """
 import os
+from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 from dotenv import load_dotenv
 
 # ── Load .env ─────────────────────────────────────────────────────────────────
@@ -28,13 +30,32 @@ GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
 # Examples: llama-3.1-8b-instant, mixtral-8x7b-32768, llama-3.1-70b-versatile
 DEFAULT_MODEL: str = os.getenv("TURGON_MODEL", "llama-3.1-8b-instant")
 
+# Per-role models for get_llm(). Legal-text rule extraction keeps the large
+# model; schema-bound SQL generation is easy enough for the small, fast tier.
+ARCHITECT_MODEL: str = os.getenv("TURGON_ARCHITECT_MODEL", "llama-3.3-70b-versatile")
+ENGINEER_MODEL: str = os.getenv("TURGON_ENGINEER_MODEL", DEFAULT_MODEL)
+
 # CrewAI agent settings
 AGENT_MAX_ITER: int = 15
 AGENT_VERBOSE: bool = True
 
+# Threads for Docling's layout/table models. Docling defaults to 4; use every
+# core unless OMP_NUM_THREADS is already set. Exported before torch/onnxruntime
+# are imported so their thread pools pick it up too.
+os.environ.setdefault("OMP_NUM_THREADS", str(os.cpu_count() or 4))
+PDF_NUM_THREADS: int = int(os.environ["OMP_NUM_THREADS"])
+
+# Load Docling's PDF models in a background thread when agents.py is imported
+# (set TURGON_PREWARM=1), so the first Phase 1 parse skips the cold start.
+PREWARM_PDF_MODELS: bool = os.getenv("TURGON_PREWARM", "0") == "1"
+
 # ── DuckDB ─────────────────────────────────────────────────────────────────────
 DUCKDB_PATH: Path = DATA_DIR / "aml.db"
 
+# Optional cap for the one-off CSV load (e.g. "8GB"). DuckDB defaults to 80%
+# of RAM; set lower on shared machines so large loads spill instead of swap.
+DUCKDB_MEMORY_LIMIT: str = os.getenv("TURGON_DUCKDB_MEMORY_LIMIT", "")
+
 # IBM AML dataset — place CSV files in the data/ directory.
 # Download from: https://www.kaggle.com/datasets/ealtman2019/ibm-transactions-for-anti-money-laundering-aml
 # Supported file names (script will try each in order):
@@ -60,6 +81,13 @@ MAX_RULES_PER_RUN: int = 0
 # Maximum rules the QueryEngineerAgent processes per batch
 SQL_BATCH_SIZE: int = 10
 
+# Threads used by DuckDBExecutionSandboxTool to run a batch of queries
+SANDBOX_MAX_WORKERS: int = 8
+
+# ── LLM Concurrency ────────────────────────────────────────────────────────────
+# Explanation requests kept in flight at once; keep under the Groq RPM/TPM limit
+LLM_MAX_CONCURRENCY: int = int(os.getenv("TURGON_LLM_CONCURRENCY", "4"))
+
 # ── Validation ─────────────────────────────────────────────────────────────────
 if not GROQ_API_KEY:
     import warnings
@@ -70,16 +98,28 @@ if not GROQ_API_KEY:
     )
 
 
-def get_llm():
+@lru_cache(maxsize=None)
+def get_llm(role: Literal["architect", "engineer"] = "architect"):
     """
     Return a CrewAI LLM instance that routes through Groq.
     
-    Uses Groq's fast inference API with Llama models.
+    Uses Groq's fast inference API with Llama models. role="engineer" selects
+    ENGINEER_MODEL (small tier) for Phase 2 SQL generation; everything else
+    uses ARCHITECT_MODEL.
+
+    Groq caches prompt prefixes server-side with no opt-in flag; hits depend
+    on the system prompt being byte-identical across calls, which is why the
+    agent goal/backstory text lives in module-level constants in agents.py.
+    temperature=0 keeps the rest of the request deterministic as well.
+
+    Cached per role: every caller shares one client (and its HTTP pool)
+    instead of building a new one per agent or Phase 3 run.
     """
     from langchain_groq import ChatGroq
 
+    model = ENGINEER_MODEL if role == "engineer" else ARCHITECT_MODEL
     return ChatGroq(
     temperature=0,
-    model_name="groq/llama-3.3-70b-versatile",
+    model_name=f"groq/{model}",
 )
 
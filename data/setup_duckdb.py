@@ -5,7 +5,8 @@ Run this BEFORE the main Turgon pipeline.
 
 Usage:
   cd "d:\Projects\Hackfest 2.0\turgon"
-  python data/setup_duckdb.py
+  python data/setup_duckdb.py            # skips the load if aml.db is current
+  python data/setup_duckdb.py --force    # always rebuild from the CSV
 
 Dataset:
   IBM Transactions for Anti-Money Laundering (AML)
@@ -24,6 +25,7 @@ ADAPTABILITY NOTE:
 
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
 
@@ -37,7 +39,7 @@ from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
 from rich.table import Table
 
-from config import AML_CSV_CANDIDATES, DATA_DIR, DUCKDB_PATH
+from config import AML_CSV_CANDIDATES, DATA_DIR, DUCKDB_MEMORY_LIMIT, DUCKDB_PATH
 
 console = Console()
 
@@ -60,6 +62,11 @@ SEMANTIC_COLUMNS = {
     "timestamp"       : ["Timestamp", "timestamp", "date", "transaction_date", "txn_date"],
 }
 
+# Lowercased candidates, built once for case-insensitive lookups
+SEMANTIC_COLUMNS_LOWER = {
+    role: [name.lower() for name in names] for role, names in SEMANTIC_COLUMNS.items()
+}
+
 # Preferred canonical rename targets (applied during load if the raw name differs)
 CANONICAL_NAMES = {
     "from_account"    : "From_Account",
@@ -76,6 +83,14 @@ CANONICAL_NAMES = {
 }
 
 
+# Lowercased raw header → canonical name, in one dict. When a variant is
+# listed under several roles, the first role in CANONICAL_NAMES wins.
+CANDIDATE_TO_CANONICAL: dict[str, str] = {}
+for _role, _canonical in CANONICAL_NAMES.items():
+    for _candidate in SEMANTIC_COLUMNS_LOWER[_role]:
+        CANDIDATE_TO_CANONICAL.setdefault(_candidate, _canonical)
+
+
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
 def find_csv(data_dir: Path) -> Path | None:
@@ -89,61 +104,68 @@ def find_csv(data_dir: Path) -> Path | None:
 
 def get_actual_columns(conn: duckdb.DuckDBPyConnection, table: str = "transactions") -> list[str]:
     """Return the real column names that exist in the table right now."""
-    rows = conn.execute(
-        f"SELECT column_name FROM information_schema.columns "
-        f"WHERE table_name = '{table}' ORDER BY ordinal_position"
-    ).fetchall()
-    return [r[0] for r in rows]
+    # PRAGMA table_info reads the catalog directly: (cid, name, type, notnull, dflt_value, pk)
+    rows = conn.execute(f"PRAGMA table_info('{table}')").fetchall()
+    return [r[1] for r in rows]
 
 
-def resolve_column(actual_cols: list[str], role: str) -> str | None:
+def lower_index(actual_cols: list[str]) -> dict[str, str]:
+    """Map lowercased column name → actual name; build once, pass to resolve_column."""
+    return {c.lower(): c for c in actual_cols}
+
+
+def resolve_column(lower_actual: dict[str, str], role: str) -> str | None:
     """
     Find which actual column satisfies a semantic role.
     Returns the actual column name, or None if no candidate matches.
-    Case-insensitive matching.
+    Case-insensitive matching against a lower_index() map.
     """
-    lower_actual = {c.lower(): c for c in actual_cols}
-    for candidate in SEMANTIC_COLUMNS.get(role, []):
-        if candidate.lower() in lower_actual:
-            return lower_actual[candidate.lower()]
+    for candidate in SEMANTIC_COLUMNS_LOWER.get(role, ()):
+        hit = lower_actual.get(candidate)
+        if hit:
+            return hit
     return None
 
 
-def build_rename_clause(conn: duckdb.DuckDBPyConnection, csv_path: Path) -> tuple[str, dict[str, str]]:
+def _sql_str(value: str) -> str:
+    """Quote a Python string as a DuckDB string literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def build_rename_clause(
+    conn: duckdb.DuckDBPyConnection, csv_path: Path,
+) -> tuple[str, dict[str, str], dict[str, str]]:
     """
-    Inspect raw CSV headers via a 0-row read, then build a SELECT clause that:
+    Sniff the CSV dialect and column types once, then build a read_csv(...)
+    expression that:
     1. Renames semantically known columns to their canonical names
     2. Cleans all other column names (spaces/dots → underscores)
     3. Deduplicates any collisions with a _N suffix
 
-    Returns (select_clause_str, {raw_col: final_col} mapping)
+    Names and types go straight into read_csv's columns= struct with
+    auto_detect off, so the load itself is a plain parallel scan: no second
+    sniffing pass and no rename projection over the data.
+
+    The CSV path is bound as a parameter, never spliced into SQL: execute the
+    returned expression with [csv_path.as_posix()] as its single ? argument.
+
+    Returns (read_csv_expr_str, {raw_col: final_col} mapping, {final_col: type} schema)
     """
-    result = conn.execute(
-        f"SELECT * FROM read_csv_auto('{csv_path.as_posix()}', sample_size=1) LIMIT 0"
-    )
-    raw_cols: list[str] = [desc[0] for desc in result.description]
-
-    # Build a lookup: raw → canonical (for semantically known columns)
-    raw_to_canonical: dict[str, str] = {}
-    for role, canonical in CANONICAL_NAMES.items():
-        for candidate in SEMANTIC_COLUMNS[role]:
-            # Match against raw headers case-insensitively
-            for raw in raw_cols:
-                if raw.lower() == candidate.lower() and raw not in raw_to_canonical:
-                    raw_to_canonical[raw] = canonical
-                    break
-
-    # Build SELECT clause, deduplicating final names
-    select_parts = []
+    sniff = conn.execute("SELECT * FROM sniff_csv(?, sample_size=100000)", [csv_path.as_posix()])
+    dialect = dict(zip([d[0] for d in sniff.description], sniff.fetchone()))
+    raw_types: dict[str, str] = {c["name"]: c["type"] for c in dialect["Columns"]}
+    raw_cols: list[str] = list(raw_types)
+
+    # Build the columns struct, deduplicating final names
+    column_parts = []
     final_names: dict[str, str] = {}  # raw → final
+    schema: dict[str, str] = {}       # final → DuckDB type
     used: set[str] = set()
 
     for raw in raw_cols:
-        if raw in raw_to_canonical:
-            target = raw_to_canonical[raw]
-        else:
-            # Generic sanitise: spaces + dots → underscores
-            target = raw.replace(" ", "_").replace(".", "_")
+        # Semantically known header → canonical name (case-insensitive);
+        # otherwise the generic sanitise: spaces + dots → underscores
+        target = CANDIDATE_TO_CANONICAL.get(raw.lower()) or raw.replace(" ", "_").replace(".", "_")
 
         # Deduplicate
         original_target = target
@@ -154,37 +176,92 @@ def build_rename_clause(conn: duckdb.DuckDBPyConnection, csv_path: Path) -> tupl
 
         used.add(target)
         final_names[raw] = target
+        schema[target] = raw_types[raw]
+        column_parts.append(f"{_sql_str(target)}: {_sql_str(raw_types[raw])}")
+
+    # Sniffer reports "no quote/escape/comment" as "(empty)"
+    def opt(key: str) -> str:
+        value = dialect[key]
+        return "" if value == "(empty)" else value
+
+    options = [
+        "?",
+        "auto_detect=false",
+        "parallel=true",
+        f"header={str(dialect['HasHeader']).lower()}",
+        f"delim={_sql_str(opt('Delimiter'))}",
+        f"quote={_sql_str(opt('Quote'))}",
+        f"escape={_sql_str(opt('Escape'))}",
+        f"skip={dialect['SkipRows']}",
+        "ignore_errors=true",
+    ]
+    if dialect.get("DateFormat"):
+        options.append(f"dateformat={_sql_str(dialect['DateFormat'])}")
+    if dialect.get("TimestampFormat"):
+        options.append(f"timestampformat={_sql_str(dialect['TimestampFormat'])}")
+    options.append("columns={" + ", ".join(column_parts) + "}")
 
-        if raw == target:
-            select_parts.append(f'"{raw}"')
-        else:
-            select_parts.append(f'"{raw}" AS "{target}"')
-
-    return ", ".join(select_parts), final_names
+    return "read_csv(" + ", ".join(options) + ")", final_names, schema
 
 
 def create_indexes_adaptive(conn: duckdb.DuckDBPyConnection, actual_cols: list[str]) -> list[str]:
     """
     Create indexes on whatever semantically important columns actually exist.
     Returns list of columns that got indexed.
+
+    The amount columns are deliberately not indexed: rules range-scan them
+    against thresholds, which DuckDB's per-row-group min/max zonemaps already
+    prune, so an ART index there only costs a full sort at load time.
     """
-    index_roles = [
-        "amount_paid", "amount_received", "pay_format",
-        "is_laundering", "from_bank", "to_bank",
-    ]
+    index_roles = ["pay_format", "is_laundering", "from_bank", "to_bank"]
+    lower_actual = lower_index(actual_cols)
+    targets = [col for col in (resolve_column(lower_actual, role) for role in index_roles) if col]
+
+    def ddl(col: str) -> str:
+        return f'CREATE INDEX IF NOT EXISTS "idx_{col.lower()}" ON transactions("{col}")'
+
+    # All indexes in one transaction (one commit / checkpoint)
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        for col in targets:
+            conn.execute(ddl(col))
+        conn.execute("COMMIT")
+        return targets
+    except duckdb.Error:
+        conn.execute("ROLLBACK")
+
+    # A failure aborts the whole transaction; retry one by one so the
+    # indexable columns still get theirs
     indexed = []
-    for role in index_roles:
-        col = resolve_column(actual_cols, role)
-        if col:
-            idx_name = f"idx_{col.lower()}"
-            try:
-                conn.execute(f'CREATE INDEX IF NOT EXISTS "{idx_name}" ON transactions("{col}")')
-                indexed.append(col)
-            except duckdb.Error:
-                pass  # index may already exist or column type not indexable
+    for col in targets:
+        try:
+            conn.execute(ddl(col))
+            indexed.append(col)
+        except duckdb.Error:
+            pass  # index may already exist or column type not indexable
     return indexed
 
 
+def materialized_view_ddl(name: str, where: str, index_col: str | None) -> list[str]:
+    """
+    DDL that materialises a selective filter over transactions as table
+    mv_<name> (indexed on index_col when given) and exposes it under the
+    original view name, so queries against the view read the small table
+    instead of re-scanning transactions. Also upserts name/built_at/rowcount
+    into mv_meta so consumers can tell when it was last refreshed.
+    """
+    table = f"mv_{name}"
+    ddl = [f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM transactions WHERE {where}"]
+    if index_col:
+        ddl.append(f'CREATE INDEX IF NOT EXISTS "idx_{table}_{index_col.lower()}" ON {table}("{index_col}")')
+    ddl.append(f"CREATE OR REPLACE VIEW {name} AS SELECT * FROM {table}")
+    ddl.append(
+        f"INSERT OR REPLACE INTO mv_meta "
+        f"SELECT '{name}', current_timestamp, COUNT(*) FROM {table}"
+    )
+    return ddl
+
+
 def create_views_adaptive(conn: duckdb.DuckDBPyConnection, actual_cols: list[str]) -> list[str]:
     """
     Build compliance views using only columns that actually exist.
@@ -192,9 +269,16 @@ def create_views_adaptive(conn: duckdb.DuckDBPyConnection, actual_cols: list[str
     Returns list of views successfully created.
     """
     created = []
+    # Every statement is collected here and sent to DuckDB as one script in
+    # one transaction, instead of a parse/bind/commit round trip per DDL.
+    ddl = [
+        "CREATE TABLE IF NOT EXISTS mv_meta ("
+        "name VARCHAR PRIMARY KEY, built_at TIMESTAMP, rowcount BIGINT)"
+    ]
 
     # ── Resolve semantic columns ───────────────────────────────────────────────
-    c = {role: resolve_column(actual_cols, role) for role in SEMANTIC_COLUMNS}
+    lower_actual = lower_index(actual_cols)
+    c = {role: resolve_column(lower_actual, role) for role in SEMANTIC_COLUMNS}
 
     # ── account_summary ───────────────────────────────────────────────────────
     if c["from_account"] and c["from_bank"] and c["amount_paid"]:
@@ -214,30 +298,25 @@ def create_views_adaptive(conn: duckdb.DuckDBPyConnection, actual_cols: list[str
             )
 
         group_cols = f'"{c["from_account"]}", "{c["from_bank"]}"'
-        sql = (
-            "CREATE VIEW account_summary AS\n"
+        ddl.append(
+            "CREATE OR REPLACE VIEW account_summary AS\n"
             f"SELECT {', '.join(parts)}\n"
             f"FROM transactions\n"
             f"GROUP BY {group_cols}"
         )
-        conn.execute("DROP VIEW IF EXISTS account_summary")
-        conn.execute(sql)
         created.append("account_summary")
 
     # ── high_value_transactions ────────────────────────────────────────────────
     if c["amount_paid"]:
-        conn.execute("DROP VIEW IF EXISTS high_value_transactions")
-        conn.execute(
-            f'CREATE VIEW high_value_transactions AS '
-            f'SELECT * FROM transactions WHERE "{c["amount_paid"]}" >= 10000'
+        ddl += materialized_view_ddl(
+            "high_value_transactions", f'"{c["amount_paid"]}" >= 10000', c["from_account"],
         )
         created.append("high_value_transactions")
 
     # ── currency_mismatch ─────────────────────────────────────────────────────
     if c["pay_currency"] and c["recv_currency"]:
-        conn.execute("DROP VIEW IF EXISTS currency_mismatch")
-        conn.execute(
-            f'CREATE VIEW currency_mismatch AS '
+        ddl.append(
+            f'CREATE OR REPLACE VIEW currency_mismatch AS '
             f'SELECT * FROM transactions '
             f'WHERE "{c["pay_currency"]}" != "{c["recv_currency"]}"'
         )
@@ -245,18 +324,35 @@ def create_views_adaptive(conn: duckdb.DuckDBPyConnection, actual_cols: list[str
 
     # ── laundering_confirmed ───────────────────────────────────────────────────
     if c["is_laundering"]:
-        conn.execute("DROP VIEW IF EXISTS laundering_confirmed")
-        conn.execute(
-            f'CREATE VIEW laundering_confirmed AS '
-            f'SELECT * FROM transactions WHERE "{c["is_laundering"]}" = 1'
+        ddl += materialized_view_ddl(
+            "laundering_confirmed", f'"{c["is_laundering"]}" = 1', c["from_account"],
         )
         created.append("laundering_confirmed")
 
+    conn.execute("BEGIN TRANSACTION;\n" + ";\n".join(ddl) + ";\nCOMMIT;")
     return created
 
 
 # ── Main setup orchestrator ────────────────────────────────────────────────────
 
+def is_up_to_date(csv_path: Path) -> bool:
+    """
+    True when DUCKDB_PATH already holds a load of exactly this CSV (same path
+    and mtime, per transactions_stats). The database file is DuckDB's native
+    compressed format, so re-using it skips CSV parsing entirely.
+    """
+    if not DUCKDB_PATH.exists():
+        return False
+    try:
+        with duckdb.connect(database=str(DUCKDB_PATH), read_only=True) as conn:
+            row = conn.execute(
+                "SELECT source_csv, source_mtime_ns FROM transactions_stats"
+            ).fetchone()
+    except duckdb.Error:
+        return False  # no stats table yet (older setup) or unreadable file
+    return row == (str(csv_path.resolve()), csv_path.stat().st_mtime_ns)
+
+
 def setup_database(csv_path: Path) -> None:
     console.print(Panel(
         f"[bold cyan]Turgon — DuckDB Setup[/]\n"
@@ -268,7 +364,7 @@ def setup_database(csv_path: Path) -> None:
     conn = duckdb.connect(database=str(DUCKDB_PATH))
 
     # ── Step 1: Inspect raw schema and build rename clause (before Progress) ────
-    rename_clause, col_map = build_rename_clause(conn, csv_path)
+    rename_clause, col_map, schema = build_rename_clause(conn, csv_path)
     console.print(f"\n[dim]Column mapping ({len(col_map)} columns):[/]")
     for raw, final in col_map.items():
         marker = "->" if raw != final else "  "
@@ -288,17 +384,26 @@ def setup_database(csv_path: Path) -> None:
 
         # ── Step 2: Load data ──────────────────────────────────────────────────
         t2 = progress.add_task("Loading transactions into DuckDB...", total=None)
-        conn.execute("DROP TABLE IF EXISTS transactions")
-        conn.execute(f"""
-            CREATE TABLE transactions AS
-            SELECT {rename_clause}
-            FROM read_csv_auto(
-                '{csv_path.as_posix()}',
-                header=true,
-                sample_size=100000,
-                ignore_errors=true
-            )
-        """)
+        # Scan with every core; row order is irrelevant to the compliance
+        # queries, and dropping it lets the parallel reader skip re-ordering.
+        conn.execute(f"PRAGMA threads={os.cpu_count() or 1}")
+        conn.execute("PRAGMA preserve_insertion_order=false")
+        if DUCKDB_MEMORY_LIMIT:
+            conn.execute(f"SET memory_limit = '{DUCKDB_MEMORY_LIMIT}'")
+        # Create the typed table up front and INSERT inside one transaction:
+        # DuckDB then writes compressed row groups straight to the database
+        # file as the scan runs (optimistic writes) instead of buffering the
+        # whole load in transaction-local storage and spilling it to temp.
+        columns_ddl = ", ".join(f'"{name}" {dtype}' for name, dtype in schema.items())
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            conn.execute("DROP TABLE IF EXISTS transactions")
+            conn.execute(f"CREATE TABLE transactions ({columns_ddl})")
+            conn.execute(f"INSERT INTO transactions SELECT * FROM {rename_clause}", [csv_path.as_posix()])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
         progress.update(t2, description="[green]Transactions loaded.")
 
         # ── Step 3: Introspect actual table columns AFTER load ─────────────────
@@ -315,14 +420,25 @@ def setup_database(csv_path: Path) -> None:
         progress.update(t4, description=f"[green]Views created: {', '.join(views_created) or 'none'}.")
 
     # ── Summary ────────────────────────────────────────────────────────────────
-    row_count = conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+    # Both counts in one scan, stored in transactions_stats so later steps can
+    # read them back (SELECT * FROM transactions_stats) without re-scanning.
+    # laundering_count is NULL when the dataset has no laundering column.
+    is_laund_col = resolve_column(lower_index(actual_cols), "is_laundering")
+    laund_expr = f'COUNT(*) FILTER (WHERE "{is_laund_col}" = 1)' if is_laund_col else "NULL::BIGINT"
+    # source_* record which CSV (path + mtime) the table was loaded from, so
+    # a re-run can tell the database is already current (see is_up_to_date).
+    conn.execute(
+        "CREATE OR REPLACE TABLE transactions_stats AS "
+        f"SELECT COUNT(*) AS row_count, {laund_expr} AS laundering_count, "
+        "?::VARCHAR AS source_csv, ?::BIGINT AS source_mtime_ns FROM transactions",
+        [str(csv_path.resolve()), csv_path.stat().st_mtime_ns],
+    )
+    row_count, laund_count = conn.execute(
+        "SELECT row_count, laundering_count FROM transactions_stats"
+    ).fetchone()
 
     # Laundering count — only if the column exists
-    is_laund_col = resolve_column(actual_cols, "is_laundering")
     if is_laund_col:
-        laund_count = conn.execute(
-            f'SELECT COUNT(*) FROM transactions WHERE "{is_laund_col}" = 1'
-        ).fetchone()[0]
         laund_str = f"Laundering flagged: [red]{laund_count:,}[/] ({100*laund_count/max(row_count,1):.2f}%)\n"
     else:
         laund_str = "[dim]Is_Laundering column not detected in this dataset.[/]\n"
@@ -330,10 +446,7 @@ def setup_database(csv_path: Path) -> None:
     schema_table = Table(title="transactions — final schema", header_style="bold magenta")
     schema_table.add_column("Column", style="cyan")
     schema_table.add_column("Type", style="yellow")
-    for col, dtype in conn.execute(
-        "SELECT column_name, data_type FROM information_schema.columns "
-        "WHERE table_name='transactions' ORDER BY ordinal_position"
-    ).fetchall():
+    for _, col, dtype, *_ in conn.execute("PRAGMA table_info('transactions')").fetchall():
         schema_table.add_row(col, dtype)
 
     console.print(schema_table)
@@ -368,6 +481,15 @@ def main() -> None:
         ))
         sys.exit(1)
 
+    if "--force" not in sys.argv[1:] and is_up_to_date(csv_path):
+        console.print(Panel(
+            f"[bold green]{DUCKDB_PATH.name} is already loaded from {csv_path.name}.[/]\n"
+            "Skipping the CSV load. Re-run with [cyan]--force[/] to rebuild.",
+            title="DuckDB Ready",
+            border_style="green",
+        ))
+        return
+
     setup_database(csv_path)
 
 
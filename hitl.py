@@ -6,25 +6,47 @@ in a JSON file. Append-only per rule_id — latest decision wins.
 """
 from __future__ import annotations
 
-import json
 from datetime import datetime
 from pathlib import Path
 
+import orjson
+
 ROOT           = Path(__file__).parent.resolve()
 HITL_JSON      = ROOT / "rules" / "hitl_decisions.json"
 HITL_JSON.parent.mkdir(parents=True, exist_ok=True)
 
 VALID_ACTIONS = {"CONFIRMED", "DISMISSED", "ESCALATED", "PENDING"}
 
+# Last parse of HITL_JSON, keyed on (mtime_ns, size) so repeated reads in one
+# process skip the file read + JSON decode until the file actually changes.
+_cache: tuple[tuple[int, int], dict[str, dict]] | None = None
+
 
 def load_decisions() -> dict[str, dict]:
-    """Return {rule_id: decision_dict}."""
-    if HITL_JSON.exists():
-        try:
-            return json.loads(HITL_JSON.read_text(encoding="utf-8"))
-        except Exception:
-            pass
-    return {}
+    """Return {rule_id: decision_dict} (shared between callers; do not mutate)."""
+    global _cache
+    try:
+        st = HITL_JSON.stat()
+    except OSError:
+        return {}
+    key = (st.st_mtime_ns, st.st_size)
+    if _cache is not None and _cache[0] == key:
+        return _cache[1]
+    try:
+        decisions = orjson.loads(HITL_JSON.read_bytes())
+    except Exception:
+        return {}
+    _cache = (key, decisions)
+    return decisions
+
+
+def _write(decisions: dict[str, dict]) -> None:
+    global _cache
+    HITL_JSON.write_bytes(orjson.dumps(decisions, option=orjson.OPT_INDENT_2))
+    # Seed the cache with what we just wrote: a same-size rewrite within one
+    # coarse mtime tick would otherwise keep the old stat key and stale data.
+    st = HITL_JSON.stat()
+    _cache = ((st.st_mtime_ns, st.st_size), decisions)
 
 
 def save_decision(
@@ -40,7 +62,7 @@ def save_decision(
     if action not in VALID_ACTIONS:
         raise ValueError(f"Invalid action '{action}'. Must be one of {VALID_ACTIONS}")
 
-    decisions = load_decisions()
+    decisions = dict(load_decisions())
     decision = {
         "rule_id":   rule_id,
         "action":    action,
@@ -49,21 +71,50 @@ def save_decision(
         "timestamp": datetime.utcnow().isoformat() + "Z",
     }
     decisions[rule_id] = decision
-    HITL_JSON.write_text(
-        json.dumps(decisions, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
+    _write(decisions)
     return decision
 
 
+def save_decisions_bulk(decisions: list[dict]) -> list[dict]:
+    """
+    Upsert many decisions with one read and one write of HITL_JSON (instead
+    of one full rewrite per rule). Each item needs rule_id and action;
+    analyst and notes are optional. Validates everything before writing.
+    Returns the saved decision dicts.
+    """
+    for d in decisions:
+        if not d.get("rule_id"):
+            raise ValueError(f"Decision is missing rule_id: {d!r}")
+        if d.get("action") not in VALID_ACTIONS:
+            raise ValueError(f"Invalid action '{d.get('action')}'. Must be one of {VALID_ACTIONS}")
+    if not decisions:
+        return []
+
+    ts = datetime.utcnow().isoformat() + "Z"
+    saved = [
+        {
+            "rule_id":   d["rule_id"],
+            "action":    d["action"],
+            "analyst":   d.get("analyst", "analyst"),
+            "notes":     d.get("notes", ""),
+            "timestamp": ts,
+        }
+        for d in decisions
+    ]
+    merged = dict(load_decisions())
+    merged.update((d["rule_id"], d) for d in saved)
+    _write(merged)
+    return saved
+
+
 def get_decision(rule_id: str) -> dict | None:
     return load_decisions().get(rule_id)
 
 
 def clear_decision(rule_id: str) -> None:
-    decisions = load_decisions()
+    decisions = dict(load_decisions())
     decisions.pop(rule_id, None)
-    HITL_JSON.write_text(json.dumps(decisions, indent=2), encoding="utf-8")
+    _write(decisions)
 
 
 def summary() -> dict:
@@ -43,14 +43,18 @@ console = Console()
 
 # ── Internal Helpers ───────────────────────────────────────────────────────────
 
+_JSON_FENCE_RE = re.compile(r"```json\s*(\[\s*\{.*?\}\s*\])\s*```", re.DOTALL)
+_BARE_FENCE_RE = re.compile(r"```\s*(\[\s*\{.*?\}\s*\])\s*```", re.DOTALL)
+
+
 def _extract_json_array(text: str) -> str | None:
     """Extract standard JSON array from LLM output, resilient to markdown blocks."""
     # Try fully-fenced ```json [ ... ] ```
-    match = re.search(r"```json\s*(\[\s*\{.*?\}\s*\])\s*```", text, re.DOTALL)
+    match = _JSON_FENCE_RE.search(text)
     if match: return match.group(1)
     
     # Try generic fenced ``` [ ... ] ```
-    match = re.search(r"```\s*(\[\s*\{.*?\}\s*\])\s*```", text, re.DOTALL)
+    match = _BARE_FENCE_RE.search(text)
     if match: return match.group(1)
     
     # Fallback: grab from first [ to last ]
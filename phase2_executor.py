@@ -11,12 +11,15 @@ contain all data needed to build SQL without an AI agent.
 from __future__ import annotations
 
 import json
+import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 import duckdb
+import orjson
 
 # ── Paths ─────────────────────────────────────────────────────────────────────
 ROOT = Path(__file__).parent.resolve()
@@ -25,7 +28,9 @@ REPORT_JSON = ROOT / "rules" / "violation_report.json"
 DB_PATH     = ROOT / "data" / "aml.db"
 
 MAX_SAMPLE_ROWS = 5
-ROW_CAP = 1000  # safety cap for violation rows
+# DuckDB releases the GIL while a query runs, so validated rules are executed
+# concurrently on per-thread cursors of one read-only connection.
+MAX_WORKERS = min(8, os.cpu_count() or 1)
 
 
 # ── DDL/DML blocklist ─────────────────────────────────────────────────────────
@@ -34,6 +39,7 @@ _BLOCKED_KEYWORDS = [
     "TRUNCATE", "REPLACE", "MERGE", "EXEC", "EXECUTE", "CALL",
     "GRANT", "REVOKE", "COPY", "ATTACH", "DETACH", "LOAD", "IMPORT", "EXPORT",
 ]
+_BLOCKED_RE = re.compile(r"\b(" + "|".join(_BLOCKED_KEYWORDS) + r")\b")
 _SELECT_RE = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
 _INLINE_CMT = re.compile(r"--[^\n]*")
 _BLOCK_CMT  = re.compile(r"/\*.*?\*/", re.DOTALL)
@@ -44,10 +50,9 @@ def _validate_sql(sql: str) -> tuple[bool, str]:
     cleaned = _INLINE_CMT.sub(" ", cleaned).strip()
     if not _SELECT_RE.match(cleaned):
         return False, f"Must start with SELECT, got: {cleaned.split()[0] if cleaned.split() else '(empty)'}"
-    sql_up = cleaned.upper()
-    for kw in _BLOCKED_KEYWORDS:
-        if re.search(r"\b" + kw + r"\b", sql_up):
-            return False, f"Blocked keyword: {kw}"
+    m = _BLOCKED_RE.search(cleaned.upper())
+    if m:
+        return False, f"Blocked keyword: {m.group(1)}"
     stmts = [s.strip() for s in cleaned.split(";") if s.strip()]
     if len(stmts) > 1:
         return False, f"Multiple statements ({len(stmts)} found)"
@@ -68,11 +73,8 @@ _PREFERRED_COLS = [
 def _get_select_cols(conn: duckdb.DuckDBPyConnection) -> str:
     """Build SELECT clause from columns that actually exist in the table."""
     try:
-        rows = conn.execute(
-            "SELECT column_name FROM information_schema.columns "
-            "WHERE table_name = 'transactions' ORDER BY ordinal_position"
-        ).fetchall()
-        actual = {r[0] for r in rows}
+        rows = conn.execute("PRAGMA table_info('transactions')").fetchall()
+        actual = {r[1] for r in rows}
         matched = [c for c in _PREFERRED_COLS if c in actual]
         if matched:
             return ", ".join(matched)
@@ -81,8 +83,24 @@ def _get_select_cols(conn: duckdb.DuckDBPyConnection) -> str:
     except Exception:
         return ", ".join(_PREFERRED_COLS)
 
+
+# sql_hint fragments simple enough to AND onto the WHERE clause verbatim
+_HINT_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r"Payment_Format\s*=\s*'[^']*'",
+        r"Payment_Currency\s*!=\s*Receiving_Currency",
+        r"Is_Laundering\s*=\s*1",
+        r"Amount_Paid\s*%\s*1000\s*=\s*0",
+    )
+]
+
+
 def _build_sql(rule: dict, select_cols: str = ", ".join(_PREFERRED_COLS)) -> str | None:
-    """Build a SELECT query from a rule dict. Returns None if unsupported."""
+    """
+    Build a single-table row-filter SELECT from a rule dict, whatever its
+    rule_type. Returns None if the rule has no condition field; run() then
+    reports it as SKIPPED (nothing else picks it up).
+    """
     field     = rule.get("condition_field", "").strip()
     operator  = rule.get("operator", "=").strip()
     threshold = rule.get("threshold_value")
@@ -112,15 +130,8 @@ def _build_sql(rule: dict, select_cols: str = ", ".join(_PREFERRED_COLS)) -> str
 
     # Append extra conditions from sql_hint if it looks like a simple condition
     # e.g. "Payment_Format = 'Cash'"  or  "Payment_Currency != Receiving_Currency"
-    hint_patterns = [
-        r"Payment_Format\s*=\s*'[^']*'",
-        r"Payment_Currency\s*!=\s*Receiving_Currency",
-        r"Is_Laundering\s*=\s*1",
-        r"Amount_Paid\s*%\s*1000\s*=\s*0",
-        r"Payment_Format\s*=\s*'[^']*'",
-    ]
-    for pat in hint_patterns:
-        m = re.search(pat, sql_hint, re.IGNORECASE)
+    for pat in _HINT_PATTERNS:
+        m = pat.search(sql_hint)
         if m:
             condition = m.group(0).strip()
             if condition.upper() not in " ".join(where_parts).upper():
@@ -137,7 +148,14 @@ def _build_sql(rule: dict, select_cols: str = ", ".join(_PREFERRED_COLS)) -> str
 
 # ── Serialiser ────────────────────────────────────────────────────────────────
 
+# DuckDB hands back these as-is for the common column types; only anything
+# else (Decimal, datetime, UUID, nested values, ...) needs the trial encode.
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
 def _serialize(val: Any) -> Any:
+    if isinstance(val, _JSON_SCALARS):
+        return val
     try:
         json.dumps(val)
         return val
@@ -147,12 +165,49 @@ def _serialize(val: Any) -> Any:
 
 # ── Main executor ─────────────────────────────────────────────────────────────
 
+def _execute_rule(conn: duckdb.DuckDBPyConnection, rule_id: str, description: str, sql: str) -> dict:
+    """
+    Run one validated query on its own cursor and return the report entry.
+
+    The violation count is aggregated inside DuckDB and only MAX_SAMPLE_ROWS
+    rows are fetched, so matching rows never have to be shipped to Python.
+    """
+    cursor = conn.cursor()
+    try:
+        count = cursor.execute(f"SELECT COUNT(*) FROM (\n{sql}\n)").fetchone()[0]
+        rel = cursor.execute(sql + f"\nLIMIT {MAX_SAMPLE_ROWS}")
+        cols = [d[0] for d in rel.description]
+        samples = [{k: _serialize(v) for k, v in zip(cols, r)} for r in rel.fetchall()]
+        print(f"  [{rule_id}] SUCCESS — {count:,} violations")
+        return {
+            "rule_id": rule_id,
+            "rule_description": description,
+            "sql": sql,
+            "violation_count": count,
+            "sample_violations": samples,
+            "status": "SUCCESS",
+        }
+    except Exception as e:
+        print(f"  [{rule_id}] SQL_ERROR — {e}")
+        return {
+            "rule_id": rule_id,
+            "rule_description": description,
+            "sql": sql,
+            "violation_count": 0,
+            "sample_violations": [],
+            "status": "SQL_ERROR",
+            "reason": str(e),
+        }
+    finally:
+        cursor.close()
+
+
 def run() -> list[dict]:
     if not RULES_JSON.exists():
         print(f"[ERROR] Rules file not found: {RULES_JSON}")
         return []
 
-    rules: list[dict] = json.loads(RULES_JSON.read_text(encoding="utf-8"))
+    rules: list[dict] = orjson.loads(RULES_JSON.read_bytes())
     print(f"[Phase 2] Loaded {len(rules)} rules from {RULES_JSON.name}")
 
     if not DB_PATH.exists():
@@ -161,7 +216,9 @@ def run() -> list[dict]:
 
     conn = duckdb.connect(database=str(DB_PATH), read_only=True)
     select_cols = _get_select_cols(conn)
-    report: list[dict] = []
+    # One slot per rule keeps the report in rule order while queries run out of order
+    report: list[dict | None] = []
+    pending: list[tuple[int, str, str, str]] = []
     t0 = time.time()
 
     for rule in rules:
@@ -196,44 +253,23 @@ def run() -> list[dict]:
             print(f"  [{rule_id}] BLOCKED — {reason}")
             continue
 
-        # Execute
-        try:
-            sql_capped = sql + f"\nLIMIT {ROW_CAP}"
-            rel = conn.execute(sql_capped)
-            cols = [d[0] for d in rel.description]
-            rows = rel.fetchall()
-            violations = [{k: _serialize(v) for k, v in zip(cols, r)} for r in rows]
-            count = len(violations)
+        pending.append((len(report), rule_id, description, sql))
+        report.append(None)
 
-            report.append({
-                "rule_id": rule_id,
-                "rule_description": description,
-                "sql": sql,
-                "violation_count": count,
-                "sample_violations": violations[:MAX_SAMPLE_ROWS],
-                "status": "SUCCESS",
-            })
-            print(f"  [{rule_id}] SUCCESS — {count:,} violations")
-        except Exception as e:
-            report.append({
-                "rule_id": rule_id,
-                "rule_description": description,
-                "sql": sql,
-                "violation_count": 0,
-                "sample_violations": [],
-                "status": "SQL_ERROR",
-                "reason": str(e),
-            })
-            print(f"  [{rule_id}] SQL_ERROR — {e}")
+    # Execute
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = [
+            (slot, pool.submit(_execute_rule, conn, rule_id, description, sql))
+            for slot, rule_id, description, sql in pending
+        ]
+        for slot, future in futures:
+            report[slot] = future.result()
 
     conn.close()
     duration = time.time() - t0
 
     REPORT_JSON.parent.mkdir(parents=True, exist_ok=True)
-    REPORT_JSON.write_text(
-        json.dumps(report, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
+    REPORT_JSON.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
     print(f"\n[Phase 2] Violation report saved -> {REPORT_JSON}")
 
     # Audit log
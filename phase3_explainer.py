@@ -8,17 +8,26 @@ Output: rules/explanations.json
 """
 from __future__ import annotations
 
+import hashlib
 import json
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import orjson
+
 ROOT             = Path(__file__).parent.resolve()
 RULES_JSON       = ROOT / "rules" / "policy_rules.json"
 VIOLATIONS_JSON  = ROOT / "rules" / "violation_report.json"
 EXPLANATIONS_JSON = ROOT / "rules" / "explanations.json"
+LLM_CACHE_JSON   = ROOT / "rules" / "explanation_cache.json"
 
 RISK_THRESHOLDS = {"HIGH": 500, "MEDIUM": 50, "LOW": 1}
 
+# Outermost {...} in an LLM reply that wraps the JSON object in prose
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
 # ── Fallback deterministic explainer (no LLM required) ────────────────────────
 
 _RULE_TYPE_CONTEXT = {
@@ -85,10 +94,25 @@ def _deterministic_explanation(rule: dict, violation: dict) -> dict:
     }
 
 
-def _llm_explanation(rule: dict, violation: dict, llm) -> dict | None:
+def _load_llm_cache() -> dict[str, dict]:
+    try:
+        return orjson.loads(LLM_CACHE_JSON.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+
+def _llm_explanation(
+    rule: dict, violation: dict, llm, cache: dict | None = None,
+    model: str = "", used: set[str] | None = None,
+) -> dict | None:
     """
     Try to enrich the explanation using the LLM.
     Falls back to None on any error (caller uses deterministic fallback).
+
+    Parsed responses are memoised in `cache` by a hash of model + prompt, so
+    re-running Phase 3 on an unchanged report skips the LLM round trip and a
+    model switch never serves the old model's text. Keys touched this run are
+    added to `used` so the caller can prune the rest.
     """
     try:
         rule_id = rule.get("id", "?")
@@ -116,14 +140,21 @@ Return ONLY a JSON object with these exact keys:
 
 Return ONLY the JSON object, no other text."""
 
-        response = llm.call([{"role": "user", "content": prompt}])
-        content  = response if isinstance(response, str) else str(response)
-
-        # Extract JSON from response
-        import re
-        m = re.search(r"\{.*\}", content, re.DOTALL)
-        if m:
-            data = json.loads(m.group(0))
+        key  = hashlib.sha256(f"{model}\0{prompt}".encode()).hexdigest()
+        if used is not None:
+            used.add(key)
+        data = cache.get(key) if cache is not None else None
+        if data is None:
+            response = llm.call([{"role": "user", "content": prompt}])
+            content  = response if isinstance(response, str) else str(response)
+
+            # Extract JSON from response
+            m = _JSON_OBJECT_RE.search(content)
+            if m:
+                data = orjson.loads(m.group(0))
+                if cache is not None:
+                    cache[key] = data
+        if data is not None:
             return {
                 "rule_id":           rule_id,
                 "alert_headline":    data.get("alert_headline", ""),
@@ -149,8 +180,8 @@ def run(use_llm: bool = True) -> list[dict]:
         print("[Phase 3] No rules file found. Run Phase 1 first.")
         return []
 
-    violations: list[dict] = json.loads(VIOLATIONS_JSON.read_text(encoding="utf-8"))
-    rules_raw:  list[dict] = json.loads(RULES_JSON.read_text(encoding="utf-8"))
+    violations: list[dict] = orjson.loads(VIOLATIONS_JSON.read_bytes())
+    rules_raw:  list[dict] = orjson.loads(RULES_JSON.read_bytes())
 
     # Build rule lookup
     rule_map: dict[str, dict] = {r.get("id", ""): r for r in rules_raw}
@@ -160,10 +191,17 @@ def run(use_llm: bool = True) -> list[dict]:
     print(f"[Phase 3] Generating explanations for {len(triggered)} triggered rules...")
 
     llm = None
+    llm_model = ""
+    llm_cache: dict[str, dict] = {}
+    used_keys: set[str] = set()
+    max_concurrency = 1
     if use_llm:
         try:
-            from config import get_llm
+            from config import ARCHITECT_MODEL, LLM_MAX_CONCURRENCY, get_llm
             llm = get_llm()
+            llm_model = ARCHITECT_MODEL
+            max_concurrency = max(1, LLM_MAX_CONCURRENCY)
+            llm_cache = _load_llm_cache()
             print("[Phase 3] LLM loaded — using AI-enriched explanations.")
         except Exception as e:
             print(f"[Phase 3] LLM unavailable ({e}), using deterministic fallback.")
@@ -172,18 +210,25 @@ def run(use_llm: bool = True) -> list[dict]:
     t0 = time.time()
     explanations: list[dict] = []
 
-    for v in triggered:
+    def _explain(v: dict) -> dict:
         rule_id = v.get("rule_id", "")
-        rule    = rule_map.get(rule_id, {})
-        rule.setdefault("id", rule_id)
+        rule    = {"id": rule_id, **rule_map.get(rule_id, {})}
 
         explanation = None
         if llm and use_llm:
-            explanation = _llm_explanation(rule, v, llm)
+            explanation = _llm_explanation(rule, v, llm, llm_cache, llm_model, used_keys)
 
         if explanation is None:
             explanation = _deterministic_explanation(rule, v)
+        return explanation
+
+    # LLM latency is almost all server-side, so overlap up to LLM_MAX_CONCURRENCY
+    # requests; map() yields results in rule order.
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        results = list(pool.map(_explain, triggered))
 
+    for v, explanation in zip(triggered, results):
+        rule_id = v.get("rule_id", "")
         explanations.append(explanation)
         marker = "AI" if explanation.get("generated_by") == "llm" else "DET"
         print(f"  [{rule_id}] {marker} — {explanation['risk_level']} risk — {explanation['alert_headline'][:60]}")
@@ -206,11 +251,12 @@ def run(use_llm: bool = True) -> list[dict]:
             })
 
     EXPLANATIONS_JSON.parent.mkdir(parents=True, exist_ok=True)
-    EXPLANATIONS_JSON.write_text(
-        json.dumps(explanations, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
+    EXPLANATIONS_JSON.write_bytes(orjson.dumps(explanations, option=orjson.OPT_INDENT_2))
     print(f"\n[Phase 3] Explanations saved -> {EXPLANATIONS_JSON}")
+
+    if llm:
+        # Keep only this run's entries: stale prompts/models never pile up
+        LLM_CACHE_JSON.write_bytes(orjson.dumps({k: llm_cache[k] for k in used_keys if k in llm_cache}))
     print(f"[Phase 3] {len(triggered)} rules explained in {duration:.1f}s")
 
     # Audit log
@@ -138,23 +138,29 @@ against the AML transaction database using structured policy rules.
 1. **Generate SQL**: Write a SELECT query that finds transactions VIOLATING the rule.
    - Use the exact column names from the schema above
    - Use the rule's `condition_field`, `operator`, and `threshold_value`
-   - Include relevant columns: From_Account, To_Account, Amount_Paid, Amount_Received, 
-     Payment_Format, Is_Laundering, and any condition fields
+   - Group by the identifying columns that matter for the rule (e.g. From_Account,
+     To_Account, Payment_Format) and project aggregates per group: COUNT(*) AS violations,
+     SUM(Amount_Paid) AS total_paid, and the condition field where useful
    - Add `WHERE Is_Laundering = 1` only for validation cross-checks, not for the actual filter
+   - Never use `SELECT *` — the validator rejects it unless the query has a GROUP BY.
+     Let DuckDB aggregate (COUNT(*), SUM(Amount_Paid), GROUP BY From_Account) instead of
+     returning every matching row
    
    Example for a threshold rule (amount > 10000):
    ```sql
-   SELECT From_Bank, From_Account, To_Bank, To_Account, 
-          Amount_Paid, Payment_Currency, Payment_Format, Timestamp
+   SELECT From_Account, COUNT(*) AS violations, SUM(Amount_Paid) AS total_paid
    FROM aml.transactions
    WHERE Amount_Paid > 10000
+   GROUP BY From_Account
    ```
 
 2. **Validate**: Use `secure_sql_validator` with your generated SQL.
    - If validation fails, rewrite the query and try again
    - NEVER use DROP, DELETE, UPDATE, INSERT, or any DDL
 
-3. **Execute**: Use `duckdb_execution_sandbox` with the validated SQL and the rule's `id`.
+3. **Execute**: Use `duckdb_execution_sandbox` once per batch, passing every validated
+   query of the batch as `queries`: a JSON array of {{"sql": "...", "rule_id": "..."}}.
+   The sandbox runs them concurrently and returns one result per query, in order.
 
 4. **Record results**: Note the rule_id, SQL used, row_count, and first few violation rows.
 
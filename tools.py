@@ -11,23 +11,36 @@ Tools:
 
 from __future__ import annotations
 
+import atexit
 import hashlib
 import json
 import re
 import shutil
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Type
 
 import duckdb
+import orjson
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+try:
+    import sqlglot
+    from sqlglot import exp
+except ImportError:  # SecureSQLValidatorTool falls back to its keyword blocklist
+    sqlglot = None
+
 from config import (
     DUCKDB_PATH,
     MAX_VIOLATION_ROWS,
+    PDF_NUM_THREADS,
     RULES_JSON_PATH,
+    SANDBOX_MAX_WORKERS,
 )
 
 # ── Versioning paths (sit alongside policy_rules.json) ────────────────────────
@@ -39,38 +52,45 @@ _VERSION_MANIFEST = RULES_JSON_PATH.parent / "policy_versions.json"
 # Versioning helpers
 # ══════════════════════════════════════════════════════════════════════════════
 
-def _next_version() -> int:
+def _read_manifest() -> list[dict]:
+    """Return the raw version manifest (oldest first), or [] if missing/corrupt."""
+    # Just open it: a missing file is one failed read, not an exists() stat first
+    try:
+        return orjson.loads(_VERSION_MANIFEST.read_bytes())
+    except Exception:
+        return []
+
+
+def _next_version(manifest: list[dict]) -> int:
     """Return the next version number based on the manifest."""
-    if _VERSION_MANIFEST.exists():
-        try:
-            manifest = json.loads(_VERSION_MANIFEST.read_text(encoding="utf-8"))
-            return max((e.get("version", 0) for e in manifest), default=0) + 1
-        except Exception:
-            pass
-    return 1
+    return max((e.get("version", 0) for e in manifest), default=0) + 1
 
 
-def _snapshot_current_rules(pdf_source: str = "unknown") -> dict | None:
+def _snapshot_current_rules(pdf_source: str = "unknown", rule_count: int | None = None) -> dict | None:
     """
     Copy current policy_rules.json into versions/ and update the manifest.
     Returns the manifest entry dict, or None if there was nothing to snapshot.
+
+    Pass rule_count when the caller has already parsed the rules file, so it
+    isn't read and decoded a second time just to be counted.
     """
     if not RULES_JSON_PATH.exists():
         return None
 
     _VERSIONS_DIR.mkdir(parents=True, exist_ok=True)
 
-    version = _next_version()
-    ts      = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    # Read the manifest once: it gives both the next version and the list to append to
+    manifest = _read_manifest()
+    version  = _next_version(manifest)
+    ts       = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
 
-    # Read current rules so we can record rule_count
-    try:
-        current_rules = json.loads(RULES_JSON_PATH.read_text(encoding="utf-8"))
-        rule_count    = len(current_rules)
-    except Exception:
-        rule_count = 0
+    if rule_count is None:
+        try:
+            rule_count = len(orjson.loads(RULES_JSON_PATH.read_bytes()))
+        except Exception:
+            rule_count = 0
 
-    # Copy the file
+    # Copy the file (byte copy; no decode)
     archive_name = f"policy_rules_v{version}__{ts}.json"
     archive_path = _VERSIONS_DIR / archive_name
     shutil.copy2(RULES_JSON_PATH, archive_path)
@@ -84,45 +104,29 @@ def _snapshot_current_rules(pdf_source: str = "unknown") -> dict | None:
         "archive":    archive_name,
     }
 
-    # Load + append manifest
-    manifest: list[dict] = []
-    if _VERSION_MANIFEST.exists():
-        try:
-            manifest = json.loads(_VERSION_MANIFEST.read_text(encoding="utf-8"))
-        except Exception:
-            manifest = []
-
     manifest.append(entry)
-    _VERSION_MANIFEST.write_text(
-        json.dumps(manifest, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
+    _VERSION_MANIFEST.write_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
 
     return entry
 
 
 def load_version_manifest() -> list[dict]:
     """Return the full version manifest (newest first). Safe to call from app.py."""
-    if not _VERSION_MANIFEST.exists():
-        return []
     try:
-        manifest = json.loads(_VERSION_MANIFEST.read_text(encoding="utf-8"))
-        return sorted(manifest, key=lambda e: e.get("version", 0), reverse=True)
+        return sorted(_read_manifest(), key=lambda e: e.get("version", 0), reverse=True)
     except Exception:
         return []
 
 
 def load_rules_at_version(version: int) -> list[dict]:
     """Load the policy_rules.json snapshot for a specific version number."""
-    manifest = load_version_manifest()
-    for entry in manifest:
+    # Lookup only — no need for load_version_manifest()'s sorted copy
+    for entry in _read_manifest():
         if entry.get("version") == version:
-            archive_path = _VERSIONS_DIR / entry["archive"]
-            if archive_path.exists():
-                try:
-                    return json.loads(archive_path.read_text(encoding="utf-8"))
-                except Exception:
-                    return []
+            try:
+                return orjson.loads((_VERSIONS_DIR / entry["archive"]).read_bytes())
+            except Exception:
+                return []
     return []
 
 
@@ -135,10 +139,23 @@ class DoclingPDFParserInput(BaseModel):
     pdf_path: str = Field(..., description="Absolute or relative path to the PDF file to parse.")
 
 
+# DocumentConverter instances keyed by (backend, ocr). Docling loads its layout
+# and table models lazily on first use, so sharing a converter means the model
+# load is paid once per process — see DoclingPDFParserTool.prewarm().
+_converters: dict[tuple[str, bool], Any] = {}
+_converters_lock = threading.Lock()
+
+
 class DoclingPDFParserTool(BaseTool):
     """
     Parse a regulatory PDF using Docling, preserving tables and layout.
     Returns a single structured text string suitable for rule extraction.
+
+    Backend: defaults to pypdfium2, which parses roughly 2x faster than the
+    docling-parse backend with far lower peak memory. docling-parse ("dlparse_v4")
+    recovers cell boundaries better on table-heavy PDFs — switch to it if
+    threshold tables come out garbled. OCR is off by default since AML/FinCEN
+    guidance PDFs are born-digital text.
     """
 
     name: str = "docling_pdf_parser"
@@ -149,6 +166,60 @@ class DoclingPDFParserTool(BaseTool):
         "Output: full structured text content of the document."
     )
     args_schema: Type[BaseModel] = DoclingPDFParserInput
+    backend: str = "pypdfium2"   # "pypdfium2" | "dlparse_v4"
+    ocr: bool = False
+
+    def _get_converter(self):
+        """Return the shared DocumentConverter for this tool's backend + OCR setting."""
+        key = (self.backend, self.ocr)
+        with _converters_lock:
+            if key not in _converters:
+                _converters[key] = self._build_converter()
+            return _converters[key]
+
+    def prewarm(self) -> None:
+        """Load Docling's PDF pipeline models now instead of on the first parse."""
+        try:
+            from docling.datamodel.base_models import InputFormat
+            self._get_converter().initialize_pipeline(InputFormat.PDF)
+        except Exception:
+            pass  # _run() reports any real failure when a PDF is parsed
+
+    def _build_converter(self):
+        """Return a DocumentConverter configured for this tool's backend + OCR setting."""
+        from docling.datamodel.base_models import InputFormat
+        from docling.datamodel.pipeline_options import (
+            AcceleratorDevice,
+            AcceleratorOptions,
+            PdfPipelineOptions,
+        )
+        from docling.document_converter import DocumentConverter, PdfFormatOption
+
+        if self.backend == "dlparse_v4":
+            from docling.backend.docling_parse_v4_backend import (
+                DoclingParseV4DocumentBackend as backend_cls,
+            )
+        else:
+            from docling.backend.pypdfium2_backend import (
+                PyPdfiumDocumentBackend as backend_cls,
+            )
+
+        pipeline_options = PdfPipelineOptions(
+            do_ocr=self.ocr,
+            # AUTO picks CUDA/MPS when present, otherwise CPU
+            accelerator_options=AcceleratorOptions(
+                num_threads=PDF_NUM_THREADS,
+                device=AcceleratorDevice.AUTO,
+            ),
+        )
+        return DocumentConverter(
+            format_options={
+                InputFormat.PDF: PdfFormatOption(
+                    pipeline_options=pipeline_options,
+                    backend=backend_cls,
+                )
+            }
+        )
 
     def _run(self, pdf_path: str) -> str:
         try:
@@ -164,7 +235,7 @@ class DoclingPDFParserTool(BaseTool):
 
         # ── Attempt 1: Full pipeline (layout-aware, table detection) ─────────
         try:
-            converter = DocumentConverter()
+            converter = self._get_converter()
             result = converter.convert(str(path))
             markdown_text = result.document.export_to_markdown()
             pipeline_used = "standard"
@@ -225,6 +296,9 @@ class DoclingPDFParserTool(BaseTool):
 # 2. RULE STORE WRITER TOOL  (✨ versioning added)
 # ══════════════════════════════════════════════════════════════════════════════
 
+# Leading ```json / trailing ``` fence lines around the agent's rules payload
+_CODE_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$", re.MULTILINE)
+
 
 class RuleStoreWriterInput(BaseModel):
     rules_json: str = Field(
@@ -278,7 +352,7 @@ class RuleStoreWriterTool(BaseTool):
     def _run(self, rules_json: str, pdf_source: str = "unknown") -> str:
         # ── Parse input ───────────────────────────────────────────────────────
         try:
-            cleaned = re.sub(r"^```(?:json)?\s*|\s*```$", "", rules_json.strip(), flags=re.MULTILINE)
+            cleaned = _CODE_FENCE_PATTERN.sub("", rules_json.strip())
             incoming: list[dict] = json.loads(cleaned)
         except json.JSONDecodeError as e:
             return f"ERROR: Invalid JSON input — {e}"
@@ -308,22 +382,20 @@ class RuleStoreWriterTool(BaseTool):
             except json.JSONDecodeError:
                 existing = []
 
+        # Fingerprint each rule once and build the existing set once — O(N + M)
+        existing_fps = {r.get("_fingerprint") for r in existing}
+        incoming_fps = [self._fingerprint(r) for r in valid_rules]
+
         # ── ✨ Snapshot BEFORE modifying ──────────────────────────────────────
         snapshot_entry = None
-        rules_are_changing = any(
-            self._fingerprint(r) not in {e.get("_fingerprint") for e in existing}
-            for r in valid_rules
-        )
+        rules_are_changing = any(fp not in existing_fps for fp in incoming_fps)
         if rules_are_changing and RULES_JSON_PATH.exists():
-            snapshot_entry = _snapshot_current_rules(pdf_source=pdf_source)
-
-        existing_fps = {r.get("_fingerprint") for r in existing}
+            snapshot_entry = _snapshot_current_rules(pdf_source=pdf_source, rule_count=len(existing))
 
         # ── Deduplicate and merge ─────────────────────────────────────────────
         added = 0
         skipped = 0
-        for rule in valid_rules:
-            fp = self._fingerprint(rule)
+        for rule, fp in zip(valid_rules, incoming_fps):
             if fp in existing_fps:
                 skipped += 1
             else:
@@ -382,15 +454,99 @@ _DDL_DML_BLOCKLIST: tuple[str, ...] = (
     "IMPORT",
     "EXPORT",
 )
+_BLOCKLIST_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(k) for k in _DDL_DML_BLOCKLIST) + r")\b"
+)
+
+# AST node types that mean "this statement writes or changes state".
+# getattr() keeps the tuple valid across sqlglot versions that add/rename nodes.
+_BLOCKED_NODE_TYPES: tuple = ()
+if sqlglot is not None:
+    _BLOCKED_NODE_TYPES = tuple(
+        getattr(exp, name) for name in (
+            "Insert", "Update", "Delete", "Merge", "Drop", "Create", "Alter",
+            "TruncateTable", "Copy", "Attach", "Detach", "Grant", "Revoke",
+            "Command", "Pragma", "Set", "Use", "Install", "Export", "LoadData",
+        )
+        if hasattr(exp, name)
+    )
 
 # Allowlist — the only statement type permitted
 _SELECT_PATTERN = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
 
+# Projection check — SELECT * / t.* ships whole rows to Python; aggregate in
+# DuckDB instead. Matches the outer SELECT and every set-operation branch.
+_SELECT_STAR_PATTERN = re.compile(
+    r"(?:^|\bUNION(?:\s+ALL)?|\bINTERSECT|\bEXCEPT)\s*\(?\s*"
+    r"SELECT\s+(?:DISTINCT\s+)?(?:\w+\.)?\*",
+    re.IGNORECASE,
+)
+_GROUP_BY_PATTERN    = re.compile(r"\bGROUP\s+BY\b", re.IGNORECASE)
+_LIMIT_PATTERN       = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+
 # Comment stripping patterns
 _INLINE_COMMENT = re.compile(r"--[^\n]*")
 _BLOCK_COMMENT  = re.compile(r"/\*.*?\*/", re.DOTALL)
 
 
+@lru_cache(maxsize=4096)
+def _parse_sql(cleaned: str) -> tuple | None:
+    """
+    Parse comment-stripped SQL with sqlglot (DuckDB dialect).
+
+    Returns None when sqlglot is missing or cannot parse the statement, in which
+    case callers fall back to regex checks. Cached because rules re-emit
+    identical SQL across runs.
+    """
+    if sqlglot is None:
+        return None
+    try:
+        return tuple(sqlglot.parse(cleaned, read="duckdb"))
+    except sqlglot.errors.SqlglotError:
+        return None
+
+
+def _find_blocked_construct(cleaned: str) -> str | None:
+    """
+    Return the name of the first DDL/DML construct in comment-stripped SQL, or None.
+
+    Walks the sqlglot AST when available, so keywords inside string literals or
+    column names are not false positives.
+    """
+    statements = _parse_sql(cleaned)
+    if statements is not None:
+        for tree in statements:
+            node = tree.find(*_BLOCKED_NODE_TYPES) if tree is not None else None
+            if node is not None:
+                return node.key.upper()
+        return None
+
+    match = _BLOCKLIST_PATTERN.search(cleaned.upper())
+    return match.group(1) if match else None
+
+
+def _outer_selects(tree):
+    """The SELECTs whose rows a query returns: itself, or every set-operation branch."""
+    if isinstance(tree, exp.Subquery):
+        yield from _outer_selects(tree.this)
+    elif isinstance(tree, getattr(exp, "SetOperation", exp.Union)):  # Union base on older sqlglot
+        yield from _outer_selects(tree.left)
+        yield from _outer_selects(tree.right)
+    elif isinstance(tree, exp.Select):
+        yield tree
+
+
+def _selects_star_without_group_by(cleaned: str) -> bool:
+    """True if any returned SELECT (incl. UNION branches) projects * or t.* without GROUP BY."""
+    statements = _parse_sql(cleaned)
+    if statements:
+        return any(
+            any(e.is_star for e in sel.selects) and not sel.args.get("group")
+            for sel in _outer_selects(statements[0])
+        )
+    return bool(_SELECT_STAR_PATTERN.search(cleaned)) and not _GROUP_BY_PATTERN.search(cleaned)
+
+
 class SecureSQLValidatorInput(BaseModel):
     sql: str = Field(..., description="The SQL query string to validate.")
 
@@ -401,8 +557,10 @@ class SecureSQLValidatorTool(BaseTool):
 
     Layer 1: Strip SQL comments (prevent disguising DDL inside comments)
     Layer 2: Enforce SELECT-only (allowlist approach)
-    Layer 3: Token blocklist scan for DDL/DML keywords (even in subqueries)
+    Layer 3: DDL/DML scan of the parsed AST (even in subqueries); keyword
+             blocklist fallback when sqlglot is unavailable
     Layer 4: Semicolon injection check (prevent multi-statement attacks)
+    Layer 5: Projection check — no bare SELECT * (project aggregates/columns)
 
     Returns JSON: {"valid": true} or {"valid": false, "reason": "..."}
     """
@@ -436,18 +594,16 @@ class SecureSQLValidatorTool(BaseTool):
                 ),
             })
 
-        # ── Layer 3: Blocklist token scan ─────────────────────────────────────
-        sql_upper = cleaned.upper()
-        for blocked in _DDL_DML_BLOCKLIST:
-            pattern = re.compile(r"\b" + re.escape(blocked) + r"\b")
-            if pattern.search(sql_upper):
-                return json.dumps({
-                    "valid": False,
-                    "reason": (
-                        f"Blocked keyword '{blocked}' detected. "
-                        "Turgon enforces strictly read-only queries."
-                    ),
-                })
+        # ── Layer 3: DDL/DML scan ─────────────────────────────────────────────
+        blocked = _find_blocked_construct(cleaned)
+        if blocked:
+            return json.dumps({
+                "valid": False,
+                "reason": (
+                    f"Blocked keyword '{blocked}' detected. "
+                    "Turgon enforces strictly read-only queries."
+                ),
+            })
 
         # ── Layer 4: Semicolon injection check ────────────────────────────────
         statements = [s.strip() for s in cleaned.split(";") if s.strip()]
@@ -460,6 +616,16 @@ class SecureSQLValidatorTool(BaseTool):
                 ),
             })
 
+        # ── Layer 5: Projection check ─────────────────────────────────────────
+        if _selects_star_without_group_by(cleaned):
+            return json.dumps({
+                "valid": False,
+                "reason": (
+                    "SELECT * is not permitted without GROUP BY. Project aggregate "
+                    "violation counts/sums and the identifying columns you need."
+                ),
+            })
+
         return json.dumps({"valid": True})
 
 
@@ -468,51 +634,109 @@ class SecureSQLValidatorTool(BaseTool):
 # ══════════════════════════════════════════════════════════════════════════════
 
 
+class SandboxQuery(BaseModel):
+    sql: str = Field(..., description="The SELECT SQL query to execute.")
+    rule_id: str = Field(default="unknown", description="The rule ID this query checks.")
+
+
 class DuckDBExecutionSandboxInput(BaseModel):
-    sql: str = Field(..., description="The SELECT SQL query to execute against the AML database.")
+    sql: str = Field(
+        default="",
+        description="The SELECT SQL query to execute against the AML database.",
+    )
     rule_id: str = Field(
         default="unknown",
         description="The rule ID associated with this query (for audit logging).",
     )
+    queries: list[SandboxQuery] = Field(
+        default_factory=list,
+        description=(
+            "Batch mode: a list of {sql, rule_id} objects executed concurrently. "
+            "When given, 'sql' and 'rule_id' are ignored."
+        ),
+    )
+
+
+# Shared read-only connection — each query runs on its own cursor, so a batch
+# can scan in parallel (DuckDB releases the GIL) against one buffer pool.
+_sandbox_conn: duckdb.DuckDBPyConnection | None = None
+_sandbox_conn_lock = threading.Lock()
+
+
+def _get_sandbox_conn() -> duckdb.DuckDBPyConnection:
+    global _sandbox_conn
+    with _sandbox_conn_lock:
+        if _sandbox_conn is None:
+            _sandbox_conn = duckdb.connect(database=str(DUCKDB_PATH), read_only=True)
+        return _sandbox_conn
+
+
+@atexit.register
+def close_sandbox_conn() -> None:
+    """
+    Close the shared sandbox connection (also run at interpreter exit).
+
+    An open read-only handle keeps aml.db locked against setup_duckdb.py, so
+    long-lived callers should call this once their batch of queries is done;
+    the next query simply reopens it.
+    """
+    global _sandbox_conn
+    with _sandbox_conn_lock:
+        if _sandbox_conn is not None:
+            _sandbox_conn.close()
+            _sandbox_conn = None
 
 
 class DuckDBExecutionSandboxTool(BaseTool):
     """
-    Execute a validated read-only SQL query against the AML DuckDB sandbox.
+    Execute validated read-only SQL queries against the AML DuckDB sandbox.
 
     Safety guarantees:
     - Runs SecureSQLValidatorTool FIRST — rejects any non-SELECT statement
     - Opens DuckDB in READ-ONLY mode — writes are physically impossible
     - Caps result rows at MAX_VIOLATION_ROWS to prevent memory DoS
     - All errors are caught and returned as JSON (never propagated)
+
+    Accepts a single query (sql + rule_id) or a batch (queries); a batch is
+    executed on up to SANDBOX_MAX_WORKERS threads and returns a JSON array of
+    per-query results in input order.
     """
 
     name: str = "duckdb_execution_sandbox"
     description: str = (
-        "Execute a validated read-only SELECT SQL query against the AML DuckDB sandbox. "
+        "Execute validated read-only SELECT SQL queries against the AML DuckDB sandbox. "
         "Always validates the SQL for safety before execution. "
-        "Input: SQL query string and optional rule_id. "
-        "Output: JSON with execution results or error details."
+        "Input: either a SQL query string and optional rule_id, or 'queries' — a list "
+        "of {sql, rule_id} objects to execute together in one call. "
+        "Output: JSON with execution results or error details (a JSON array in batch mode)."
     )
     args_schema: Type[BaseModel] = DuckDBExecutionSandboxInput
 
-    def _run(self, sql: str, rule_id: str = "unknown") -> str:
+    def _run(self, sql: str = "", rule_id: str = "unknown", queries: list | None = None) -> str:
+        if queries:
+            batch = [q if isinstance(q, SandboxQuery) else SandboxQuery(**q) for q in queries]
+            with ThreadPoolExecutor(max_workers=SANDBOX_MAX_WORKERS) as pool:
+                results = list(pool.map(lambda q: self._execute_one(q.sql, q.rule_id), batch))
+            return json.dumps(results, default=str)
+        return json.dumps(self._execute_one(sql, rule_id), default=str)
+
+    def _execute_one(self, sql: str, rule_id: str) -> dict:
         # ── Step 1: Security validation FIRST ────────────────────────────────
         validator = SecureSQLValidatorTool()
         validation_result = json.loads(validator._run(sql))
 
         if not validation_result.get("valid"):
-            return json.dumps({
+            return {
                 "rule_id": rule_id,
                 "status": "BLOCKED",
                 "reason": validation_result.get("reason"),
                 "violations": [],
                 "row_count": 0,
-            })
+            }
 
         # ── Step 2: Check database exists ─────────────────────────────────────
         if not DUCKDB_PATH.exists():
-            return json.dumps({
+            return {
                 "rule_id": rule_id,
                 "status": "ERROR",
                 "reason": (
@@ -521,18 +745,18 @@ class DuckDBExecutionSandboxTool(BaseTool):
                 ),
                 "violations": [],
                 "row_count": 0,
-            })
+            }
 
         # ── Step 3: Execute in read-only sandbox ──────────────────────────────
-        conn = None
+        cursor = None
         try:
-            conn = duckdb.connect(database=str(DUCKDB_PATH), read_only=True)
+            cursor = _get_sandbox_conn().cursor()
 
             sql_capped = sql.rstrip().rstrip(";")
-            if not re.search(r"\bLIMIT\b", sql_capped, re.IGNORECASE):
+            if not _LIMIT_PATTERN.search(sql_capped):
                 sql_capped = f"{sql_capped} LIMIT {MAX_VIOLATION_ROWS}"
 
-            relation = conn.execute(sql_capped)
+            relation = cursor.execute(sql_capped)
             columns  = [desc[0] for desc in relation.description]
             rows     = relation.fetchall()
 
@@ -550,31 +774,31 @@ class DuckDBExecutionSandboxTool(BaseTool):
                 for row in violations
             ]
 
-            return json.dumps({
+            return {
                 "rule_id":      rule_id,
                 "status":       "SUCCESS",
                 "sql_executed": sql_capped,
                 "row_count":    len(violations_serialized),
                 "capped_at":    MAX_VIOLATION_ROWS,
                 "violations":   violations_serialized,
-            }, default=str)
+            }
 
         except duckdb.Error as e:
-            return json.dumps({
+            return {
                 "rule_id":    rule_id,
                 "status":     "SQL_ERROR",
                 "reason":     str(e),
                 "violations": [],
                 "row_count":  0,
-            })
+            }
         except Exception as e:
-            return json.dumps({
+            return {
                 "rule_id":    rule_id,
                 "status":     "ERROR",
                 "reason":     f"Unexpected error: {str(e)}",
                 "violations": [],
                 "row_count":  0,
-            })
+            }
         finally:
-            if conn:
-                conn.close()
\ No newline at end of file
+            if cursor:
+                cursor.close()